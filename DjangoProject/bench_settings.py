@@ -0,0 +1,27 @@
+"""
+Settings for the local benchmark suite: everything from settings.py, on SQLite.
+
+    python manage.py migrate --settings=DjangoProject.bench_settings
+    python manage.py seed_benchmark --scale 10 --settings=DjangoProject.bench_settings
+    python manage.py run_benchmark --settings=DjangoProject.bench_settings
+"""
+
+import os
+
+# SQLite only: the primary's password is required by settings.py but unused here
+os.environ.setdefault('DB_PASSWORD', '')
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR
+
+DEBUG = False
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'bench.sqlite3',
+    }
+}
+
+# Seeding creates users; a slow hasher only measures the hasher
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
@@ -49,6 +49,8 @@ CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
+    'core.routers.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -56,13 +58,15 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'DjangoProject.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates that reports render time to RequestMetricsMiddleware
+        'BACKEND': 'core.metrics.TimedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates']
         ,
         'APP_DIRS': True,
@@ -84,15 +88,167 @@ WSGI_APPLICATION = 'DjangoProject.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': 'projectdb',
-        'USER': 'postgres',
-        'PASSWORD': 'Yovana20',
-        'HOST': 'localhost',
-        'PORT': '5432',
+        'ENGINE': config('DB_ENGINE', default='django.db.backends.postgresql'),
+        'NAME': config('DB_NAME', default='projectdb'),
+        'USER': config('DB_USER', default='postgres'),
+        # no default: a missing DB_PASSWORD stops startup instead of falling back to a shipped secret
+        'PASSWORD': config('DB_PASSWORD'),
+        'HOST': config('DB_HOST', default='localhost'),
+        'PORT': config('DB_PORT', default='5432'),
+        # keep connections open between requests; health checks replace ones that died while idle
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
     }
 }
 
+# Connection pool, needs psycopg 3 with psycopg[pool] installed. A pool replaces persistent
+# connections, so CONN_MAX_AGE is 0 with it.
+if config('DB_POOL', default=False, cast=bool):
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=int),
+        },
+    }
+
+
+DATABASE_ROUTERS = []
+
+
+# Read replica
+# Set DB_REPLICA_NAME (plus DB_REPLICA_HOST etc. where they differ from the primary) to send
+# reads of GET requests to a replica, see core.routers. Locally two SQLite files work:
+# DB_ENGINE=django.db.backends.sqlite3 DB_NAME=primary.sqlite3 DB_REPLICA_NAME=replica.sqlite3
+# Migrations only run on the primary (the replica gets them through replication), so with
+# SQLite copy the file after every migrate, and whenever reads should see new data:
+#     python manage.py migrate && cp primary.sqlite3 replica.sqlite3
+
+if config('DB_REPLICA_NAME', default=''):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': config('DB_REPLICA_NAME'),
+        'USER': config('DB_REPLICA_USER', default=DATABASES['default']['USER']),
+        'PASSWORD': config('DB_REPLICA_PASSWORD', default=DATABASES['default']['PASSWORD']),
+        'HOST': config('DB_REPLICA_HOST', default=DATABASES['default']['HOST']),
+        'PORT': config('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        # tests use the primary for both aliases
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_ROUTERS.append('core.routers.ReadReplicaRouter')
+
+# Seconds a client's reads stay on the primary after it wrote (read-your-writes)
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=5, cast=int)
+
+
+# User sharding
+# With DB_SHARD_COUNT > 0 every user's projects, tasks, events, habits and profile live in one
+# of the shard_N databases (DB_SHARD_N_NAME / DB_SHARD_N_HOST, other settings as the primary).
+# The primary keeps auth, sessions and the user -> shard directory. See core.sharding.
+
+DB_SHARDS = []
+for _shard in range(config('DB_SHARD_COUNT', default=0, cast=int)):
+    DATABASES[f'shard_{_shard}'] = {
+        **DATABASES['default'],
+        'NAME': config(f'DB_SHARD_{_shard}_NAME', default=f"{DATABASES['default']['NAME']}_shard_{_shard}"),
+        'HOST': config(f'DB_SHARD_{_shard}_HOST', default=DATABASES['default']['HOST']),
+    }
+    DB_SHARDS.append(f'shard_{_shard}')
+if DB_SHARDS:
+    # before the replica router: owned rows are routed by user first
+    DATABASE_ROUTERS.insert(0, 'core.sharding.UserShardRouter')
+
+
+# Cache
+# LocMem by default; point CACHE_BACKEND/CACHE_LOCATION at Redis or Memcached to share it across nodes
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+_cache_backend = config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache')
+CACHES = {
+    'default': {
+        'BACKEND': _cache_backend,
+        'LOCATION': config('CACHE_LOCATION', default='focusly'),
+    }
+}
+
+# True when every worker process sees the same cache. What relies on cache invalidation
+# reaching other processes (cached sessions and users, feed/dashboard caches, ETags) is only
+# on by default with a shared cache; LocMem and the dummy cache live in one process.
+# Set SHARED_CACHE=True for a single-process deployment on LocMem.
+SHARED_CACHE = config('SHARED_CACHE', cast=bool, default=_cache_backend not in {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+})
+
+# Seconds a per-user calendar/habit/project feed response stays cached (with SHARED_CACHE only)
+FEED_CACHE_TIMEOUT = config('FEED_CACHE_TIMEOUT', default=300, cast=int)
+
+# Share of feed requests counted in the hit/miss stats, 0 disables the counters
+FEED_CACHE_STATS_SAMPLE_RATE = config('FEED_CACHE_STATS_SAMPLE_RATE', default=0.01, cast=float)
+
+# With a shared cache sessions are written through to the database and read from the cache;
+# a per-process cache would keep serving a session another process logged out
+SESSION_ENGINE = config('SESSION_ENGINE', default='django.contrib.sessions.backends.cached_db' if SHARED_CACHE
+                        else 'django.contrib.sessions.backends.db')
+
+# Seconds the authenticated user (with profile) stays cached between requests, 0 disables it.
+# Off without a shared cache, where a password change would not reach other processes.
+AUTH_USER_CACHE_TIMEOUT = config('AUTH_USER_CACHE_TIMEOUT', default=300 if SHARED_CACHE else 0, cast=int)
+
+# Seconds the per-user dashboard summary stays cached (with SHARED_CACHE only)
+DASHBOARD_CACHE_TIMEOUT = config('DASHBOARD_CACHE_TIMEOUT', default=60, cast=int)
+
+
+# Request metrics
+# Query count, DB/template/JSON timings as Server-Timing headers plus a 'core.metrics' log line per request
+
+REQUEST_METRICS_ENABLED = config('REQUEST_METRICS_ENABLED', default=False, cast=bool)
+
+# Requests running more queries than this are logged as warnings
+REQUEST_METRICS_QUERY_BUDGET = config('REQUEST_METRICS_QUERY_BUDGET', default=25, cast=int)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'core.metrics': {
+            'handlers': ['console'],
+            'level': config('REQUEST_METRICS_LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
+    },
+}
+
+
+# Request profiling
+# cProfile dumps of single requests, see core.middleware.ProfilingMiddleware and the profile_dumps command
+
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=False, cast=bool)
+
+# Fraction of all requests profiled on top of the ones asking for it (?profile=1 / X-Profile)
+PROFILE_SAMPLE_RATE = config('PROFILE_SAMPLE_RATE', default=0.0, cast=float)
+
+PROFILE_DIR = config('PROFILE_DIR', default=str(BASE_DIR / 'profiles'))
+
+# Functions listed in each dump's text summary
+PROFILE_TOP = config('PROFILE_TOP', default=40, cast=int)
+
+
+# Authentication
+# ProfileModelBackend loads the UserProfile with the user; ModelBackend stays listed so
+# sessions created before the switch keep working until they expire
+
+AUTHENTICATION_BACKENDS = [
+    'core.backends.ProfileModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
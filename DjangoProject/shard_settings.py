@@ -0,0 +1,31 @@
+"""
+Settings for trying the sharded mode locally: everything from settings.py, with the primary
+and three user shards on SQLite.
+
+    python manage.py migrate --settings=DjangoProject.shard_settings
+    python manage.py migrate --database shard_0 --settings=DjangoProject.shard_settings
+    python manage.py migrate --database shard_1 --settings=DjangoProject.shard_settings
+    python manage.py migrate --database shard_2 --settings=DjangoProject.shard_settings
+    python manage.py move_user_shard alice shard_2 --settings=DjangoProject.shard_settings
+"""
+
+import os
+
+# SQLite only: the primary's password is required by settings.py but unused here
+os.environ.setdefault('DB_PASSWORD', '')
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR
+
+DB_SHARDS = ['shard_0', 'shard_1', 'shard_2']
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'shard_default.sqlite3',
+    },
+    **{alias: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': BASE_DIR / f'{alias}.sqlite3'}
+       for alias in DB_SHARDS},
+}
+
+DATABASE_ROUTERS = ['core.sharding.UserShardRouter']
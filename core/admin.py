@@ -6,7 +6,7 @@ class TaskInline(admin.TabularInline):
     model = Task
     extra = 0
     fields = ['title', 'status', 'priority', 'due_date', 'is_done']
-    readonly_fields = []
+    readonly_fields = ['is_done']  # follows status, see Task.save()
     show_change_link = True
 
 
@@ -25,6 +25,7 @@ class TaskAdmin(admin.ModelAdmin):
     list_filter = ['status', 'priority', 'due_date', 'project']
     search_fields = ['title', 'description', 'project__title']
     ordering = ['due_date']
+    readonly_fields = ['is_done']  # follows status, see Task.save()
 
 
 @admin.register(CalendarEvent)
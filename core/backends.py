@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from core.cache import get_cached_user, set_cached_user
+from core import sharding
+from core.models import UserProfile
+
+
+# ModelBackend that loads the user's profile in the same query as the user, and keeps the
+# result in the cache so authenticated requests don't query auth_user at all. Entries are
+# dropped whenever the user or profile is saved (password changes included) and on logout.
+class ProfileModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        user = get_cached_user(user_id)
+        if user is None:
+            UserModel = get_user_model()
+            try:
+                users = UserModel._default_manager.all()
+                # with sharding the profile lives in another database; it is fetched on first use
+                if not sharding.enabled():
+                    users = users.select_related('userprofile')
+                user = users.get(pk=user_id)
+            except UserModel.DoesNotExist:
+                return None
+            set_cached_user(user)
+        return user if self.user_can_authenticate(user) else None
+
+
+# The user's profile, created on first use for accounts that predate the profile signal
+def get_profile(user):
+    try:
+        return user.userprofile
+    except UserProfile.DoesNotExist:
+        profile, _ = UserProfile.objects.using(sharding.shard_for(user)).get_or_create(user=user)
+        user.userprofile = profile
+        return profile
@@ -0,0 +1,197 @@
+import math
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import date, datetime, time as dtime, timedelta
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from core.models import UserProfile, Project, Task, CalendarEvent, Habit, HabitLog
+from core.sharding import db_for
+
+USERNAME_PREFIX = 'bench_user_'
+PASSWORD = 'bench-password'
+
+# Rows per user at scale 1; --scale multiplies every count
+BASE_COUNTS = {
+    'projects': 10,
+    'tasks_per_project': 12,
+    'events': 40,
+    'series': 6,
+    'habits': 6,
+}
+# How far back generated history goes; long enough for multi-year recurring series
+HISTORY = timedelta(days=3 * 365)
+
+TITLES = ['Plan', 'Review', 'Write', 'Call', 'Prepare', 'Fix', 'Ship', 'Read', 'Draft', 'Sync']
+SUBJECTS = ['report', 'budget', 'launch', 'roadmap', 'invoice', 'slides', 'notes', 'release', 'design']
+
+
+def _title(rng):
+    return f"{rng.choice(TITLES)} {rng.choice(SUBJECTS)}"
+
+
+def _aware(day, hour=9):
+    return timezone.make_aware(datetime.combine(day, dtime(hour)), timezone.get_current_timezone())
+
+
+def _projects(rng, user, count, today):
+    for _ in range(count):
+        project = Project(owner=user, title=_title(rng), description=_title(rng) * 5)
+        start = today - timedelta(days=rng.randrange(HISTORY.days))
+        project.due_date = start + timedelta(days=rng.randrange(10, 400)) if rng.random() < 0.8 else None
+        yield project
+
+
+def _tasks(rng, project, count, today):
+    for _ in range(count):
+        status = rng.choices(['pending', 'in_progress', 'completed'], [4, 2, 4])[0]
+        due = today + timedelta(days=rng.randrange(-120, 120)) if rng.random() < 0.85 else None
+        yield Task(project=project, title=_title(rng), description=_title(rng) * 8, status=status,
+                   priority=rng.choice(['low', 'medium', 'high']), due_date=due, is_done=status == 'completed')
+
+
+def _events(rng, user, count, series, today):
+    for _ in range(count):
+        start = _aware(today + timedelta(days=rng.randrange(-365, 365)), rng.randrange(7, 19))
+        yield CalendarEvent(user=user, title=_title(rng), start_time=start,
+                            end_time=start + timedelta(minutes=rng.choice([30, 60, 90])))
+    # long recurring series, most of them open-ended
+    for i in range(series):
+        start = _aware(today - HISTORY + timedelta(days=rng.randrange(60)), rng.randrange(7, 19))
+        until = (today + timedelta(days=rng.randrange(30, 365))) if i % 3 == 2 else None
+        yield CalendarEvent(user=user, title=_title(rng), start_time=start, end_time=start + timedelta(hours=1),
+                            repeat=['daily', 'weekly', 'monthly'][i % 3], repeat_until=until)
+
+
+def _habits(rng, user, count, today):
+    for i in range(count):
+        yield Habit(user=user, title=_title(rng), start_date=today - timedelta(days=rng.randrange(30, HISTORY.days)),
+                    repeat=['daily', 'daily', 'weekly', 'monthly'][i % 4])
+
+
+# A year of check-ins with roughly `rate` of the days ticked
+def _habit_logs(rng, habit, today):
+    for year in range(habit.start_date.year, today.year + 1):
+        rate = rng.uniform(0.4, 0.95)
+        log = HabitLog(habit=habit, year=year)
+        days = (date(year + 1, 1, 1) - date(year, 1, 1)).days
+        log.bits = sum(1 << day for day in range(days) if rng.random() < rate)
+        yield log
+
+
+# Generates `users` accounts with BASE_COUNTS * scale rows each. Rows go in through
+# bulk_create: the data is trusted, and history legitimately has dates in the past.
+def seed(users=1, scale=1, seed=0, stdout=None):
+    rng = random.Random(seed)
+    today = timezone.localdate()
+    counts = {name: count * scale for name, count in BASE_COUNTS.items()}
+    counts['tasks_per_project'] = BASE_COUNTS['tasks_per_project']
+    password = make_password(PASSWORD)
+    created = []
+
+    for n in range(users):
+        # the user goes to the primary; with sharding its rows go to the user's shard
+        with transaction.atomic():
+            user = User.objects.create(username=f'{USERNAME_PREFIX}{n}', password=password)
+            db = db_for(user)
+            with transaction.atomic(using=db):
+                UserProfile.objects.using(db).get_or_create(user=user)
+                projects = Project.objects.using(db).bulk_create(_projects(rng, user, counts['projects'], today),
+                                                                 batch_size=500)
+                Task.objects.using(db).bulk_create(
+                    (task for project in projects
+                     for task in _tasks(rng, project, counts['tasks_per_project'], today)),
+                    batch_size=1000,
+                )
+                CalendarEvent.objects.using(db).bulk_create(
+                    _events(rng, user, counts['events'], counts['series'], today), batch_size=1000)
+                habits = Habit.objects.using(db).bulk_create(_habits(rng, user, counts['habits'], today),
+                                                             batch_size=500)
+                HabitLog.objects.using(db).bulk_create(
+                    (log for habit in habits for log in _habit_logs(rng, habit, today)), batch_size=500)
+        created.append(user)
+        if stdout:
+            stdout.write(f"Seeded {user.username}")
+    return created
+
+
+def clear():
+    return User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+
+# name -> (path, query params); the calendar window is one month around today like the UI's month view
+def endpoints(user, today):
+    month = today.replace(day=1)
+    window = {'start': (month - timedelta(days=7)).isoformat(),
+              'end': (month + timedelta(days=42)).isoformat()}
+    biggest = Project.objects.owned_by(user).with_progress().order_by('-total_tasks', 'id').first()
+    targets = {
+        'calendar_events_json': (reverse('calendar_events_json'), window),
+        'habits_json': (reverse('habits-json'), window),
+        'projects_json': (reverse('projects-json'), window),
+        'project_list': (reverse('project_list'), {}),
+        'dashboard': (reverse('dashboard'), {}),
+    }
+    if biggest:
+        targets['project_detail'] = (reverse('project_detail', args=[biggest.pk]), {})
+    return targets
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def _fetch(client, url, params):
+    response = client.get(url, params)
+    # streamed feeds do their work while being consumed
+    body = b''.join(response.streaming_content) if response.streaming else response.content
+    return response.status_code, len(body)
+
+
+# Time every endpoint `iterations` times, then one pass under tracemalloc for peak memory.
+# With warm=False the cache is cleared before each request so the feed/dashboard caches don't hide the work.
+def run(user, iterations=20, warm=False, only=None):
+    client = Client()
+    client.force_login(user)
+    results = {}
+    for name, (url, params) in endpoints(user, timezone.localdate()).items():
+        if only and name not in only:
+            continue
+        _fetch(client, url, params)  # warm-up: materialization, template loading
+
+        timings, queries = [], []
+        for _ in range(iterations):
+            if not warm:
+                cache.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                status, size = _fetch(client, url, params)
+                timings.append((time.perf_counter() - start) * 1000)
+            queries.append(len(ctx))
+
+        if not warm:
+            cache.clear()
+        tracemalloc.start()
+        _fetch(client, url, params)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results[name] = {
+            'url': url,
+            'status': status,
+            'bytes': size,
+            'p50_ms': round(_percentile(timings, 0.50), 2),
+            'p95_ms': round(_percentile(timings, 0.95), 2),
+            'mean_ms': round(statistics.fmean(timings), 2),
+            'queries': max(queries),
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
+    return results
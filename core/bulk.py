@@ -0,0 +1,80 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models.deletion import Collector
+from core.cache import bump_data_version, bump_on_commit
+from core.models import Project, Task
+from core.sharding import db_for
+
+# Upper bound on ids per request, keeps the IN (...) lists and the transaction short
+MAX_BULK_TASKS = 500
+
+# Column changes for the actions that are a plain UPDATE
+STATUS_ACTIONS = {
+    'complete': {'status': 'completed', 'is_done': True},
+    'reopen': {'status': 'pending', 'is_done': False},
+}
+BULK_ACTIONS = ['complete', 'reopen', 'reprioritize', 'move', 'delete']
+
+
+def _parse_ids(ids):
+    if not isinstance(ids, list) or not ids:
+        raise ValidationError({'ids': "Provide a non-empty list of task ids."})
+    if len(ids) > MAX_BULK_TASKS:
+        raise ValidationError({'ids': f"At most {MAX_BULK_TASKS} tasks per request."})
+    try:
+        return list(dict.fromkeys(int(task_id) for task_id in ids))
+    except (TypeError, ValueError):
+        raise ValidationError({'ids': "Task ids must be integers."})
+
+
+# Validate the whole request up front and return the column changes it makes;
+# nothing is written unless every argument is valid
+def _changes(user, action, data):
+    if action in STATUS_ACTIONS:
+        return STATUS_ACTIONS[action]
+    if action == 'reprioritize':
+        priority = data.get('priority')
+        if priority not in dict(Task.PRIORITY_CHOICES):
+            raise ValidationError({'priority': "Select a valid priority."})
+        return {'priority': priority}
+    if action == 'move':
+        project = Project.objects.owned_by(user).filter(id=data.get('project')).only('id').first()
+        if project is None:
+            raise ValidationError({'project': "Select one of your projects."})
+        return {'project': project}
+    if action == 'delete':
+        return None
+    raise ValidationError({'action': f"Unknown action, expected one of: {', '.join(BULK_ACTIONS)}."})
+
+
+def _delete(tasks):
+    # collect the instances already loaded (with their project) so the post_delete
+    # receivers don't fetch each task's project again
+    collector = Collector(using=tasks[0]._state.db, origin=tasks)
+    collector.collect(tasks)
+    collector.delete()
+
+
+# Apply one action to many tasks in a single transaction: one query for ownership,
+# one UPDATE/DELETE for the change. Raises Task.DoesNotExist, changing nothing, when any id is
+# not one of the user's tasks. Returns {task_id: 'updated' | 'deleted'}.
+def apply_bulk_action(user, action, data):
+    ids = _parse_ids(data.get('ids'))
+    changes = _changes(user, action, data)
+
+    db = db_for(user)
+    # the receivers bump per deleted task; one bump after the commit is enough
+    with transaction.atomic(using=db), bump_on_commit(db):
+        tasks = list(Task.objects.owned_by(user).select_for_update(of=('self',)).filter(id__in=ids))
+        missing = set(ids) - {task.id for task in tasks}
+        if missing:
+            raise Task.DoesNotExist(f"No task with id {', '.join(map(str, sorted(missing)))}.")
+        if changes is None:
+            _delete(tasks)
+        else:
+            Task.objects.owned_by(user).filter(id__in=ids).update(**changes)
+            # QuerySet.update() skips post_save, so invalidate cached feeds here
+            bump_data_version(user.pk)
+
+    done = 'deleted' if changes is None else 'updated'
+    return {task_id: done for task_id in ids}
@@ -0,0 +1,144 @@
+import hashlib
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial, wraps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils import timezone
+from core.routers import use_primary
+
+VERSION_KEY = 'data-version:{user_id}'
+FEED_KEY = 'feed:{path}:{user_id}:{version}:{query}'
+STATS_KEY = 'feed-cache:{name}'
+USER_KEY = 'auth-user:{user_id}'
+
+
+# Current data version of a user; every cached feed response is keyed by it
+def get_data_version(user_id):
+    key = VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        # start from the clock so an evicted version never reuses an old number
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+# Users whose bump is held back until the enclosing bump_on_commit() block commits
+_deferred_bumps = ContextVar('deferred_bumps', default=None)
+
+
+# Invalidate everything cached for a user by moving to a new version
+def bump_data_version(user_id):
+    deferred = _deferred_bumps.get()
+    if deferred is not None:
+        deferred.add(user_id)
+        return None
+    key = VERSION_KEY.format(user_id=user_id)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = time.time_ns()
+        cache.set(key, version, None)
+        return version
+
+
+# Collect the bumps made inside the block (e.g. one post_delete per row) into one bump per user
+# once the transaction on `using` commits; nothing is bumped if the block raises
+@contextmanager
+def bump_on_commit(using):
+    user_ids = set()
+    token = _deferred_bumps.set(user_ids)
+    try:
+        yield
+    finally:
+        _deferred_bumps.reset(token)
+    for user_id in user_ids:
+        transaction.on_commit(partial(bump_data_version, user_id), using=using)
+
+
+# The authenticated user (with profile) as loaded by ProfileModelBackend, or None
+def get_cached_user(user_id):
+    if not settings.AUTH_USER_CACHE_TIMEOUT:
+        return None
+    return cache.get(USER_KEY.format(user_id=user_id))
+
+
+def set_cached_user(user):
+    if settings.AUTH_USER_CACHE_TIMEOUT:
+        cache.set(USER_KEY.format(user_id=user.pk), user, settings.AUTH_USER_CACHE_TIMEOUT)
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(USER_KEY.format(user_id=user_id))
+
+
+# Only a sample of requests update the counters, keeping the cache round trips off the rest
+def _count(name):
+    if random.random() >= settings.FEED_CACHE_STATS_SAMPLE_RATE:
+        return
+    key = STATS_KEY.format(name=name)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def cache_stats():
+    hits = cache.get(STATS_KEY.format(name='hits'), 0)
+    misses = cache.get(STATS_KEY.format(name='misses'), 0)
+    total = hits + misses
+    return {'hits': hits, 'misses': misses, 'hit_rate': round(hits / total, 3) if total else None,
+            'sample_rate': settings.FEED_CACHE_STATS_SAMPLE_RATE}
+
+
+def _feed_key(request):
+    # the window and any other params are part of the query string; a missing bound is filled
+    # in from today's date by the views, so the date is part of the key then
+    query = request.GET.urlencode()
+    if not (request.GET.get('start') and request.GET.get('end')):
+        query += f'&today={timezone.localdate().isoformat()}'
+    query = hashlib.md5(query.encode()).hexdigest()
+    return FEED_KEY.format(path=request.path, user_id=request.user.pk,
+                           version=get_data_version(request.user.pk), query=query)
+
+
+# Strong ETag for a user's JSON API responses: the same URL at the same data version (and
+# day, for open windows) always renders the same body, so a match can be answered with 304 before the view runs.
+# The body is then read from the primary, a replica may not have reached that version yet.
+# None (no ETag, no 304) without a shared cache: a per-process data version never sees
+# writes handled by other processes.
+def user_data_etag(request, *args, **kwargs):
+    if not settings.SHARED_CACHE or not request.user.is_authenticated:
+        return None
+    use_primary()
+    return hashlib.md5(_feed_key(request).encode()).hexdigest()
+
+
+# Cache a JSON feed view per user, window and data version. Off without a shared cache:
+# another process's write would not retire the entries of this one.
+def cached_feed(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not settings.SHARED_CACHE or not request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+
+        key = _feed_key(request)
+        content = cache.get(key)
+        if content is not None:
+            _count('hits')
+            return HttpResponse(content, content_type='application/json')
+
+        _count('misses')
+        # stored under the current version, so built from the primary
+        use_primary()
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming:
+            cache.set(key, response.content, settings.FEED_CACHE_TIMEOUT)
+        return response
+    return wrapper
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+CACHED_SESSION_ENGINES = {'django.contrib.sessions.backends.cache', 'django.contrib.sessions.backends.cached_db'}
+
+
+# Invalidation through a per-process cache never reaches the other processes
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    if settings.SHARED_CACHE:
+        return []
+    hint = "Configure a shared CACHE_BACKEND (Redis, Memcached), or set SHARED_CACHE=True when running one process."
+    errors = []
+    if settings.SESSION_ENGINE in CACHED_SESSION_ENGINES:
+        errors.append(Error("Cached sessions need a cache shared by all processes: a logout in one "
+                            "process would not end the session in the others.", hint=hint, id='core.E001'))
+    if settings.AUTH_USER_CACHE_TIMEOUT:
+        errors.append(Error("AUTH_USER_CACHE_TIMEOUT needs a cache shared by all processes: a password "
+                            "change in one process would not reach the others.", hint=hint, id='core.E002'))
+    return errors
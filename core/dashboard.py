@@ -0,0 +1,74 @@
+from datetime import datetime, time, timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+from core.cache import get_data_version
+from core.routers import use_primary
+from core.models import Project, Task, Habit, CalendarOccurrence
+from core.occurrences import ensure_materialized
+
+DASHBOARD_KEY = 'dashboard:{user_id}:{version}:{today}'
+DUE_SOON_DAYS = 7
+LIST_LIMIT = 10
+
+
+# Everything on the dashboard, built from a fixed number of queries regardless of account size
+def build_dashboard(user, today):
+    open_tasks = Task.objects.owned_by(user).exclude(status='completed')
+    soon = today + timedelta(days=DUE_SOON_DAYS)
+
+    task_counts = Task.objects.owned_by(user).aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(status='completed')),
+        overdue=Count('id', filter=Q(due_date__lt=today) & ~Q(status='completed')),
+        due_soon=Count('id', filter=Q(due_date__gte=today, due_date__lte=soon) & ~Q(status='completed')),
+    )
+    overdue = list(open_tasks.filter(due_date__lt=today)
+                   .select_related('project').order_by('due_date', 'id')[:LIST_LIMIT])
+    due_soon = list(open_tasks.filter(due_date__gte=today, due_date__lte=soon)
+                    .select_related('project').order_by('due_date', 'id')[:LIST_LIMIT])
+
+    day_start = timezone.make_aware(datetime.combine(today, time.min), timezone.get_current_timezone())
+    day_end = day_start + timedelta(days=1)
+    ensure_materialized(user, day_start, day_end)
+    events_today = list(CalendarOccurrence.objects
+                        .owned_by(user)
+                        .filter(event__isnull=False, start__lt=day_end, end__gte=day_start)
+                        .select_related('event').order_by('start'))
+
+    habits_today = Habit.objects.owned_by(user).prefetch_related('logs').due_on(today)
+    for habit in habits_today:
+        habit.checked_today = any(log.year == today.year and log.is_checked(today) for log in habit.logs.all())
+
+    projects = list(Project.objects.owned_by(user)
+                    .annotate(total_tasks=Count('tasks'),
+                              completed_tasks=Count('tasks', filter=Q(tasks__status='completed')))
+                    .order_by('-created_at')[:LIST_LIMIT])
+    for project in projects:
+        project.progress = round(100 * project.completed_tasks / project.total_tasks) if project.total_tasks else 0
+
+    return {
+        'task_counts': task_counts,
+        'overdue_tasks': overdue,
+        'due_soon_tasks': due_soon,
+        'events_today': events_today,
+        'habits_today': habits_today,
+        'projects': projects,
+        'project_count': Project.objects.owned_by(user).count(),
+    }
+
+
+# Cached per user with a shared cache; any write bumps the data version, which retires the entry.
+# A miss is built from the primary, a replica may not have reached the version yet.
+def get_dashboard(user):
+    today = timezone.localdate()
+    if not settings.SHARED_CACHE:
+        return build_dashboard(user, today)
+    key = DASHBOARD_KEY.format(user_id=user.pk, version=get_data_version(user.pk), today=today)
+    summary = cache.get(key)
+    if summary is None:
+        use_primary()
+        summary = build_dashboard(user, today)
+        cache.set(key, summary, settings.DASHBOARD_CACHE_TIMEOUT)
+    return summary
@@ -42,12 +42,33 @@ class TaskForm(forms.ModelForm):
             'due_date': forms.DateInput(attrs={'type': 'date'}),
         }
 
-# form to toggle task completion
-class TaskCompleteForm(forms.ModelForm):
-    class Meta:
-        model = Task
-        fields = ['is_done']
-
+# filters for the task list on the project detail page
+class TaskFilterForm(forms.Form):
+    status = forms.ChoiceField(choices=[('', 'Any status')] + Task.STATUS_CHOICES, required=False,
+                               widget=forms.Select(attrs={'class': 'form-select form-select-sm'}))
+    priority = forms.ChoiceField(choices=[('', 'Any priority')] + Task.PRIORITY_CHOICES, required=False,
+                                 widget=forms.Select(attrs={'class': 'form-select form-select-sm'}))
+    due_after = forms.DateField(required=False,
+                                widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control form-control-sm'}))
+    due_before = forms.DateField(required=False,
+                                 widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control form-control-sm'}))
+    details = forms.BooleanField(required=False, label='Show descriptions',
+                                 widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}))
+
+    def filter(self, tasks):
+        data = self.cleaned_data
+        if data.get('status'):
+            tasks = tasks.filter(status=data['status'])
+        if data.get('priority'):
+            tasks = tasks.filter(priority=data['priority'])
+        if data.get('due_after'):
+            tasks = tasks.filter(due_date__gte=data['due_after'])
+        if data.get('due_before'):
+            tasks = tasks.filter(due_date__lte=data['due_before'])
+        # description is only rendered when asked for
+        if not data.get('details'):
+            tasks = tasks.defer('description')
+        return tasks
 
 class CalendarEventForm(forms.ModelForm):
     class Meta:
@@ -0,0 +1,81 @@
+import json
+import math
+import statistics
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.utils import load_backend
+
+# Connection settings compared; each simulated request runs the same queries under each of them
+MODES = {
+    'new': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False},
+    'persistent': {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True},
+    'pool': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'OPTIONS': {'pool': {'min_size': 1, 'max_size': 2}}},
+}
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class Command(BaseCommand):
+    help = ("Measure per-request connection overhead: new connection per request vs persistent "
+            "connections with health checks vs a psycopg 3 pool, against the configured database.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--queries', type=int, default=3, help="Queries per simulated request.")
+        parser.add_argument('--modes', nargs='+', choices=list(MODES), default=['new', 'persistent'])
+
+    def _wrapper(self, alias, mode):
+        settings_dict = {**connections[alias].settings_dict, **MODES[mode]}
+        if mode == 'pool':
+            if settings_dict['ENGINE'] != 'django.db.backends.postgresql':
+                raise CommandError("The pool mode needs the PostgreSQL backend.")
+            settings_dict['OPTIONS'] = {**connections[alias].settings_dict.get('OPTIONS', {}), **MODES[mode]['OPTIONS']}
+        backend = load_backend(settings_dict['ENGINE'])
+        return backend.DatabaseWrapper(settings_dict, alias)
+
+    # What a request does to the connection: close_old_connections() on request_started and
+    # request_finished around the view's queries
+    def _request(self, connection, queries):
+        start = time.perf_counter()
+        connection.close_if_unusable_or_obsolete()
+        with connection.cursor() as cursor:
+            for _ in range(queries):
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+        connection.close_if_unusable_or_obsolete()
+        return (time.perf_counter() - start) * 1000
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError("--requests must be at least 1.")
+        report = {'database': options['database'],
+                  'vendor': connections[options['database']].vendor,
+                  'requests': options['requests'],
+                  'queries_per_request': options['queries'],
+                  'modes': {}}
+
+        for mode in options['modes']:
+            connection = self._wrapper(options['database'], mode)
+            try:
+                self._request(connection, options['queries'])  # warm-up
+                timings = [self._request(connection, options['queries']) for _ in range(options['requests'])]
+            finally:
+                connection.close()
+                if mode == 'pool':
+                    connection.close_pool()
+            report['modes'][mode] = {
+                'p50_ms': round(_percentile(timings, 0.50), 3),
+                'p95_ms': round(_percentile(timings, 0.95), 3),
+                'mean_ms': round(statistics.fmean(timings), 3),
+            }
+
+        if 'new' in report['modes']:
+            baseline = report['modes']['new']['mean_ms']
+            for mode, result in report['modes'].items():
+                result['saved_per_request_ms'] = round(baseline - result['mean_ms'], 3)
+        self.stdout.write(json.dumps(report, indent=2))
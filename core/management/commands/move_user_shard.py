@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from core import sharding
+
+
+class Command(BaseCommand):
+    help = ("Move a user's projects, tasks, events and habits to another shard. Their ids change, so "
+            "existing links and bookmarks to them (e.g. /projects/<id>/) stop working; calendar "
+            "occurrences are rebuilt on the next fetch. On PostgreSQL the user's writes wait while the "
+            "move runs.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument('shard', help="Target database alias, e.g. shard_1.")
+
+    def handle(self, *args, **options):
+        if not sharding.enabled():
+            raise CommandError("Sharding is off; set DB_SHARD_COUNT to use it.")
+        if options['shard'] not in settings.DB_SHARDS:
+            raise CommandError(f"Unknown shard '{options['shard']}', "
+                               f"expected one of: {', '.join(settings.DB_SHARDS)}.")
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['username']}' does not exist.")
+
+        source = sharding.shard_for(user)
+        if source == options['shard']:
+            self.stdout.write(f"{user.username} is already on {source}.")
+            return
+        copied = sharding.move_user(user, options['shard'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Moved {copied} row(s) of {user.username} from {source} to {options['shard']}."))
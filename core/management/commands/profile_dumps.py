@@ -0,0 +1,36 @@
+import io
+import pstats
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "List the request profiles written by ProfilingMiddleware, or merge them into one report."
+
+    def add_arguments(self, parser):
+        parser.add_argument('match', nargs='?', default='',
+                            help="Only dumps whose name contains this, e.g. a path like 'api-calendar-events'.")
+        parser.add_argument('--aggregate', action='store_true',
+                            help="Merge the matching dumps and print the top functions.")
+        parser.add_argument('--sort', default='cumulative', help="pstats sort key for --aggregate.")
+        parser.add_argument('--top', type=int, default=settings.PROFILE_TOP)
+        parser.add_argument('--dir', default=settings.PROFILE_DIR)
+
+    def handle(self, *args, **options):
+        directory = Path(options['dir'])
+        dumps = sorted(p for p in directory.glob('*.pstats') if options['match'] in p.stem)
+        if not dumps:
+            raise CommandError(f"No profiles matching '{options['match']}' in {directory}.")
+
+        if options['aggregate']:
+            output = io.StringIO()
+            stats = pstats.Stats(*map(str, dumps), stream=output)
+            output.write(f"{len(dumps)} profile(s)\n")
+            stats.sort_stats(options['sort']).print_stats(options['top'])
+            self.stdout.write(output.getvalue())
+            return
+
+        for dump in dumps:
+            stats = pstats.Stats(str(dump))
+            self.stdout.write(f"{stats.total_tt * 1000:10.1f} ms  {stats.total_calls:>9} calls  {dump.name}")
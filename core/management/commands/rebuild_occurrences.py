@@ -0,0 +1,38 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from core import occurrences, sharding
+from core.models import OccurrenceHorizon
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized CalendarOccurrence table from events and habits."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help="Only rebuild this username.")
+        parser.add_argument('--reset', action='store_true',
+                            help="Drop the stored horizons too; they are re-created on the next calendar fetch.")
+
+    def handle(self, *args, **options):
+        # with sharding the horizons are in the shards, so no join from auth_user
+        if sharding.enabled():
+            users = User.objects.all()
+        else:
+            users = User.objects.filter(occurrence_horizon__isnull=False)
+        if options['user']:
+            users = User.objects.filter(username=options['user'])
+            if not users.exists():
+                raise CommandError(f"User '{options['user']}' does not exist.")
+
+        if options['reset']:
+            deleted = 0
+            for user in users:
+                deleted += OccurrenceHorizon.objects.owned_by(user).delete()[0]
+                occurrences.rebuild(user)
+            self.stdout.write(self.style.SUCCESS(f"Reset {deleted} horizon(s)."))
+            return
+
+        count = 0
+        for user in users:
+            occurrences.rebuild(user)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt occurrences for {count} user(s)."))
@@ -0,0 +1,40 @@
+import json
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_test_environment
+from core import benchmark
+
+
+class Command(BaseCommand):
+    help = ("Hit the hot endpoints with the test client as a seeded benchmark user and report "
+            "p50/p95 latency, query counts and peak memory as JSON.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', default=f'{benchmark.USERNAME_PREFIX}0', help="Username to run as.")
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--warm', action='store_true', help="Keep the cache between requests.")
+        parser.add_argument('--only', nargs='+', metavar='ENDPOINT', help="Only run these endpoints.")
+        parser.add_argument('--output', help="Write the report to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options['user']).first()
+        if user is None:
+            raise CommandError(f"User '{options['user']}' does not exist; run seed_benchmark first.")
+        if options['iterations'] < 1:
+            raise CommandError("--iterations must be at least 1.")
+
+        # lets the test client through ALLOWED_HOSTS and uses the in-memory email backend
+        setup_test_environment()
+        report = {
+            'user': user.username,
+            'iterations': options['iterations'],
+            'warm_cache': options['warm'],
+            'endpoints': benchmark.run(user, options['iterations'], options['warm'], options['only']),
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        else:
+            self.stdout.write(output)
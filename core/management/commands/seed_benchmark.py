@@ -0,0 +1,25 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from core import benchmark
+
+
+class Command(BaseCommand):
+    help = "Generate synthetic benchmark users (bench_user_N) with projects, tasks, events, series and habits."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, choices=[1, 10, 100], default=1,
+                            help="Multiplier for the per-user row counts.")
+        parser.add_argument('--users', type=int, default=1, help="Number of accounts to generate.")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed, the same seed gives the same data.")
+        parser.add_argument('--reset', action='store_true', help="Delete existing benchmark users first.")
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            deleted, _ = benchmark.clear()
+            self.stdout.write(f"Deleted {deleted} row(s) of previous benchmark data.")
+        elif User.objects.filter(username__startswith=benchmark.USERNAME_PREFIX).exists():
+            raise CommandError("Benchmark users already exist; pass --reset to replace them.")
+
+        users = benchmark.seed(options['users'], options['scale'], options['seed'], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(users)} user(s) at {options['scale']}x (password '{benchmark.PASSWORD}')."))
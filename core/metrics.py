@@ -0,0 +1,109 @@
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.template.backends.django import DjangoTemplates
+
+# Metrics of the request being handled, None outside RequestMetricsMiddleware
+_current = ContextVar('request_metrics', default=None)
+
+_IN_LIST = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+_NUMBER = re.compile(r'\b\d+\b')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_ROWS = re.compile(r'(?:\(%s, \.\.\.\),\s*)+\(%s, \.\.\.\)')
+
+
+# Query shape without its parameters, so `WHERE id = 1` and `WHERE id = 2` count as the same query
+def query_signature(sql):
+    sql = _STRING.sub('%s', sql)
+    sql = _NUMBER.sub('%s', sql)
+    sql = _IN_LIST.sub('(%s, ...)', sql)
+    # multi-row INSERT ... VALUES of bulk_create
+    return _ROWS.sub('(%s, ...), ...', sql)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.signatures = Counter()
+        self.timings = Counter()
+        self._active = set()
+
+    # Adds the block's duration to timings[name]; nested blocks of the same name count once
+    @contextmanager
+    def timed(self, name):
+        if name in self._active:
+            yield
+            return
+        self._active.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - start
+            self._active.discard(name)
+
+    # connection.execute_wrapper() hook
+    def __call__(self, execute, sql, params, many, context):
+        with self.timed('db'):
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                self.queries += 1
+                self.signatures[query_signature(sql)] += 1
+
+    def duplicates(self, limit=5):
+        return [(sql, count) for sql, count in self.signatures.most_common(limit) if count > 1]
+
+    @property
+    def total(self):
+        return time.perf_counter() - self.started
+
+
+def current():
+    return _current.get()
+
+
+@contextmanager
+def collecting():
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+# Times the block into the current request's metrics, a no-op when none are being collected
+@contextmanager
+def timed(name):
+    metrics = _current.get()
+    if metrics is None:
+        yield
+    else:
+        with metrics.timed(name):
+            yield
+
+
+class _TimedTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        with timed('template'):
+            return self.template.render(context, request)
+
+
+# DjangoTemplates that reports render time to the request metrics; covers TemplateResponse,
+# render() and render_to_string() alike
+class TimedDjangoTemplates(DjangoTemplates):
+    def from_string(self, template_code):
+        return _TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return _TimedTemplate(super().get_template(template_name))
@@ -0,0 +1,162 @@
+import cProfile
+import io
+import json
+import logging
+import pstats
+import random
+import re
+import time
+from contextlib import ExitStack
+from datetime import datetime
+from pathlib import Path
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from core.metrics import collecting
+
+logger = logging.getLogger('core.metrics')
+
+# Server-Timing metric name for each timing collected
+TIMING_NAMES = {'db': 'db', 'template': 'tpl', 'serialize': 'ser'}
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2)
+
+
+# Streamed body that times its own iteration and calls `finish` once it is exhausted or closed
+# (the response closes its content after sending, also when the client went away early)
+class _CollectingStream:
+    def __init__(self, content, metrics, finish):
+        self.content = content
+        self.metrics = metrics
+        self.finish = finish
+
+    def __iter__(self):
+        start = time.perf_counter()
+        try:
+            yield from self.content
+        finally:
+            self.metrics.timings['stream'] = time.perf_counter() - start
+            self.close()
+
+    def close(self):
+        if self.finish is not None:
+            finish, self.finish = self.finish, None
+            finish()
+
+
+# Per-request query count, DB time, repeated query shapes, template and JSON encoding time.
+# Sent as Server-Timing headers and one JSON log line per request on the 'core.metrics' logger;
+# requests over REQUEST_METRICS_QUERY_BUDGET are logged as warnings. Off unless
+# REQUEST_METRICS_ENABLED is set, in which case it should be first in MIDDLEWARE.
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.query_budget = settings.REQUEST_METRICS_QUERY_BUDGET
+
+    def __call__(self, request):
+        stack = ExitStack()
+        metrics = stack.enter_context(collecting())
+        # wrappers attach to the connection handler, so this also covers connections opened later
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(metrics))
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            stack.close()
+            raise
+
+        if response.streaming:
+            # the body is produced while it is sent, after this returns: keep collecting until then
+            response.streaming_content = _CollectingStream(
+                response.streaming_content, metrics, lambda: self._finish_stream(stack, request, response, metrics))
+        else:
+            stack.close()
+            self._report(request, response, metrics, metrics.total)
+        # queries run while streaming only make it into the log line
+        response['Server-Timing'] = self._server_timing(metrics, metrics.total)
+        return response
+
+    def _server_timing(self, metrics, total):
+        entries = [f'{TIMING_NAMES["db"]};dur={_ms(metrics.timings["db"])};desc="{metrics.queries} queries"']
+        for name in ('template', 'serialize'):
+            if name in metrics.timings:
+                entries.append(f'{TIMING_NAMES[name]};dur={_ms(metrics.timings[name])}')
+        duplicates = sum(count - 1 for count in metrics.signatures.values() if count > 1)
+        if duplicates:
+            entries.append(f'dup;desc="{duplicates} repeated queries"')
+        if metrics.queries > self.query_budget:
+            entries.append(f'budget;desc="over query budget ({self.query_budget})"')
+        entries.append(f'total;dur={_ms(total)}')
+        return ', '.join(entries)
+
+    def _finish_stream(self, stack, request, response, metrics):
+        stack.close()
+        self._report(request, response, metrics, metrics.total)
+
+    def _report(self, request, response, metrics, total):
+        over_budget = metrics.queries > self.query_budget
+        line = {
+            'method': request.method,
+            'path': request.path,
+            'view': getattr(request.resolver_match, 'view_name', None),
+            'status': response.status_code,
+            'total_ms': _ms(total),
+            'queries': metrics.queries,
+            'over_budget': over_budget,
+            **{f'{name}_ms': _ms(seconds) for name, seconds in metrics.timings.items()},
+            'duplicates': [{'sql': sql, 'count': count} for sql, count in metrics.duplicates()],
+        }
+        logger.log(logging.WARNING if over_budget else logging.INFO, json.dumps(line))
+
+
+
+def _profile_name(request):
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', request.path).strip('-') or 'root'
+    return f"{datetime.now():%Y%m%d-%H%M%S-%f}_{request.method}_{slug[:80]}"
+
+
+# Runs the view under cProfile and writes <PROFILE_DIR>/<timestamp>_<method>_<path>.pstats
+# plus a .txt with the top PROFILE_TOP functions. Triggered by ?profile=1 or an X-Profile
+# header from staff users (anyone with DEBUG on), and for PROFILE_SAMPLE_RATE of all
+# requests. Off unless PROFILING_ENABLED; goes last in MIDDLEWARE as it calls the view itself.
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.directory = Path(settings.PROFILE_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def _requested(self, request):
+        if not (request.GET.get('profile') or request.headers.get('X-Profile')):
+            return False
+        user = getattr(request, 'user', None)
+        return settings.DEBUG or bool(user and user.is_staff)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not (self._requested(request) or random.random() < settings.PROFILE_SAMPLE_RATE):
+            return None
+
+        profiler = cProfile.Profile()
+        response = profiler.runcall(view_func, request, *view_args, **view_kwargs)
+        if hasattr(response, 'render') and callable(response.render):
+            # TemplateResponse renders after the view returns; keep the rendering in the profile
+            profiler.runcall(response.render)
+        self._dump(request, profiler)
+        return response
+
+    def _dump(self, request, profiler):
+        path = self.directory / _profile_name(request)
+        profiler.dump_stats(path.with_suffix('.pstats'))
+        summary = io.StringIO()
+        stats = pstats.Stats(profiler, stream=summary)
+        summary.write(f"{request.method} {request.get_full_path()}\n")
+        stats.sort_stats('cumulative').print_stats(settings.PROFILE_TOP)
+        path.with_suffix('.txt').write_text(summary.getvalue())
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.4 on 2026-10-18 03:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0014_calendarevent_core_calend_user_id_55b477_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OccurrenceHorizon',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='occurrence_horizon', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('start', models.DateTimeField()),
+                ('end', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CalendarOccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start', models.DateTimeField()),
+                ('end', models.DateTimeField()),
+                ('event', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='core.calendarevent')),
+                ('habit', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='core.habit')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='calendar_occurrences', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'start', 'end'], name='core_calend_user_id_6ea66f_idx')],
+                'constraints': [models.UniqueConstraint(fields=('event', 'start'), name='unique_event_occurrence'), models.UniqueConstraint(fields=('habit', 'start'), name='unique_habit_occurrence')],
+            },
+        ),
+    ]
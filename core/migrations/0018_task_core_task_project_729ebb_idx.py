@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-18 03:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_project_core_projec_owner_i_c91f29_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status', 'due_date'], name='core_task_project_729ebb_idx'),
+        ),
+    ]
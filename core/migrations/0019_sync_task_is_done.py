@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+# is_done used to drift from status (toggling only wrote status); realign existing rows
+def sync_is_done(apps, schema_editor):
+    Task = apps.get_model('core', 'Task')
+    Task.objects.filter(status='completed', is_done=False).update(is_done=True)
+    Task.objects.exclude(status='completed').filter(is_done=True).update(is_done=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_task_core_task_project_729ebb_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(sync_is_done, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,15 @@
+from django.contrib.auth.mixins import LoginRequiredMixin
+
+
+# Single-object views limited to the user's own rows. Ownership is part of the fetch
+# (someone else's object is a 404) and the object is cached, so the view loads it once.
+class OwnedObjectMixin(LoginRequiredMixin):
+    def get_queryset(self):
+        return self.model.objects.owned_by(self.request.user)
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_owned_object'):
+            self._owned_object = super().get_object()
+        return self._owned_object
@@ -1,9 +1,12 @@
-from datetime import datetime, time
+from datetime import datetime, time, timedelta
 from django.utils import timezone
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Count, Min, Q
 from django.utils.timezone import localdate
+from core.recurrence import next_occurrence, occurrences
+from core.sharding import shard_for
 from core.validations import validate_not_in_past
 
 # Extend User
@@ -16,26 +19,117 @@ class UserProfile(models.Model):
         return self.user.username
 
 
-class Project(models.Model):
+# Base for models that validate themselves on save(). Validation runs once per change:
+# full_clean() records the field values it saw, and save() then re-validates only the
+# fields changed since (nothing at all after a ModelForm has just validated the instance).
+# Fields a caller excluded from full_clean(), like ModelForm's non-form fields, count as
+# trusted. Trusted bulk paths (imports, bulk APIs) can pass save(validate=False).
+class ValidatedModel(models.Model):
+    class Meta:
+        abstract = True
+
+    def _field_values(self):
+        deferred = self.get_deferred_fields()
+        return {f.attname: getattr(self, f.attname) for f in self._meta.concrete_fields if f.attname not in deferred}
+
+    # FK fields holding a saved related instance; the row exists, so skip the existence query
+    def _attached_relations(self):
+        attached = set()
+        for field in self._meta.concrete_fields:
+            if field.is_relation and field.is_cached(self):
+                related = field.get_cached_value(self)
+                if related is not None and related.pk is not None and related.pk == getattr(self, field.attname):
+                    attached.add(field.name)
+        return attached
+
+    # None when the instance was never validated, otherwise the names of fields changed since
+    def _changed_fields(self):
+        state = getattr(self, '_validated_state', None)
+        if state is None:
+            return None
+        return {f.name for f in self._meta.concrete_fields
+                if f.attname in state and getattr(self, f.attname) != state[f.attname]}
+
+    def full_clean(self, exclude=None, validate_unique=True, validate_constraints=True):
+        exclude = set(exclude or ()) | self._attached_relations()
+        super().full_clean(exclude, validate_unique, validate_constraints)
+        self._validated_state = self._field_values()
+
+    def save(self, *args, validate=True, **kwargs):
+        if validate:
+            changed = self._changed_fields()
+            if changed is None:
+                self.full_clean()
+            elif changed:
+                self.full_clean(exclude={f.name for f in self._meta.concrete_fields} - changed)
+        super().save(*args, **kwargs)
+        if validate:
+            # pick up values set while saving (pk, auto_now_add) so an unchanged re-save is free
+            self._validated_state = self._field_values()
+
+
+# Rows belonging to one user, read from that user's shard when sharding is on (core.sharding)
+class OwnedQuerySet(models.QuerySet):
+    owner_field = 'user'
+
+    def owned_by(self, user):
+        return self.using(shard_for(user)).filter(**{self.owner_field: user})
+
+
+class ProjectQuerySet(OwnedQuerySet):
+    owner_field = 'owner'
+
+    # projects whose created_at -> due_date span overlaps [start, end); None leaves a side open
+    def overlapping(self, start, end):
+        qs = self
+        if end:
+            qs = qs.filter(created_at__lt=end)
+        if start:
+            qs = qs.filter(Q(due_date__gte=start.date()) | Q(due_date__isnull=True, created_at__gte=start))
+        return qs
+
+    # task totals, completed count and the earliest due date of open tasks, in the same query
+    def with_progress(self):
+        open_tasks = ~Q(tasks__status='completed')
+        return self.annotate(
+            total_tasks=Count('tasks'),
+            completed_tasks=Count('tasks', filter=Q(tasks__status='completed')),
+            next_due=Min('tasks__due_date', filter=open_tasks),
+        )
+
+
+class Project(ValidatedModel):
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='projects')
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     due_date = models.DateField(null=True, blank=True)
 
+    objects = ProjectQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['owner', 'due_date']),
+            models.Index(fields=['owner', '-created_at', 'id']),
+        ]
+
     #due date validation
     def clean(self):
         if self.due_date and self.created_at and self.due_date < self.created_at.date():
             raise ValidationError("Project due date cannot be before the creation date.")
 
-    def save(self, *args, **kwargs):
-        self.full_clean()
-        super().save(*args, **kwargs)
-
     def __str__(self):
         return self.title
 
-class Task(models.Model):
+class TaskQuerySet(OwnedQuerySet):
+    owner_field = 'project__owner'
+
+    # ownership goes through the project, which is loaded in the same query
+    def owned_by(self, user):
+        return super().owned_by(user).select_related('project')
+
+
+class Task(ValidatedModel):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('in_progress', 'In Progress'),
@@ -57,21 +151,43 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_done = models.BooleanField(default=False)  #   for checkbox
 
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'status', 'due_date']),
+        ]
+
     #past-date validation
     def clean(self):
         if self.due_date and self.due_date < timezone.now().date():
             raise ValidationError("Task due date cannot be in the past.")
 
     def save(self, *args, **kwargs):
-
-        self.full_clean()
+        # is_done mirrors status so the checkbox and the status label never disagree
+        self.is_done = self.status == 'completed'
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'status' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'is_done'}
         super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.title} ({self.status})"
 
 
-class CalendarEvent(models.Model):
+class CalendarEventQuerySet(OwnedQuerySet):
+    # events that can have an occurrence in [start, end): one-off events inside the range
+    # plus repeating series that haven't ended before it
+    def overlapping(self, start, end):
+        single = Q(repeat__in=['none', ''], start_time__lt=end)
+        repeating = Q(start_time__lt=end) & ~Q(repeat__in=['none', ''])
+        if start:
+            single &= Q(end_time__gte=start) | Q(end_time__isnull=True, start_time__gte=start)
+            repeating &= Q(repeat_until__gte=start.date()) | Q(repeat_until__isnull=True)
+        return self.filter(single | repeating)
+
+
+class CalendarEvent(ValidatedModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
@@ -88,6 +204,14 @@ class CalendarEvent(models.Model):
     repeat = models.CharField(max_length=10, choices=REPEAT_CHOICES, default='none', blank=True)
     repeat_until = models.DateField(null=True, blank=True)
 
+    objects = CalendarEventQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'start_time']),
+            models.Index(fields=['user', 'repeat', 'repeat_until']),
+        ]
+
     def clean(self):
         # ensure end_time is after start_time
         if self.end_time and self.start_time > self.end_time:
@@ -104,15 +228,28 @@ class CalendarEvent(models.Model):
         # ensure start_time is not in the past
         validate_not_in_past(self.start_time)
 
-    def save(self, *args, **kwargs):
-        self.full_clean()
-        super().save(*args, **kwargs)
-
     def __str__(self):
         return f"{self.title} ({self.start_time} - {self.end_time if self.end_time else 'No end'})"
 
 
-class Habit(models.Model):
+class HabitQuerySet(OwnedQuerySet):
+    # habits that can have a day in [start_day, end_day); a missing end_date means open-ended
+    def overlapping(self, start_day, end_day):
+        qs = self.filter(start_date__lt=end_day)
+        if start_day:
+            qs = qs.filter(
+                Q(end_date__gte=start_day)
+                | Q(end_date__isnull=True) & (~Q(repeat='none') | Q(start_date__gte=start_day))
+            )
+        return qs
+
+    # active habits with an occurrence on the given day
+    def due_on(self, day):
+        candidates = self.filter(active=True).overlapping(day, day + timedelta(days=1))
+        return [habit for habit in candidates if habit.is_due_on(day)]
+
+
+class Habit(ValidatedModel):
     REPEAT_CHOICES = [
         ('none', 'Does not repeat'),
         ('daily', 'Daily'),
@@ -128,17 +265,111 @@ class Habit(models.Model):
     repeat = models.CharField(max_length=10, choices=REPEAT_CHOICES, default='daily')
     active = models.BooleanField(default=True)
 
+    objects = HabitQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'active', 'start_date']),
+        ]
+
     def clean(self):
         if self.end_date and self.end_date < self.start_date:
             raise ValidationError("Habit end date cannot be before start date.")
         if self.start_date < localdate():
             raise ValidationError("Start date cannot be in the past.")
 
-    def save(self, *args, **kwargs):
-        self.full_clean()
-        super().save(*args, **kwargs)
+    # days in [first_day, last_day) the habit falls on, found without walking from start_date
+    def occurrence_days(self, first_day, last_day):
+        for day, _ in occurrences(self.start_date, None, self.repeat, self.end_date, first_day, last_day):
+            yield day
+
+    def next_occurrence(self, on_or_after):
+        return next_occurrence(self.start_date, self.repeat, self.end_date, on_or_after)
+
+    def is_due_on(self, day):
+        return self.next_occurrence(day) == day
 
     def __str__(self):
         return f"{self.title} ({self.repeat})"
 
 
+
+# One row per expanded event/habit occurrence, kept in sync by core.occurrences
+class CalendarOccurrence(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='calendar_occurrences')
+    event = models.ForeignKey(CalendarEvent, on_delete=models.CASCADE, null=True, blank=True, related_name='occurrences')
+    habit = models.ForeignKey(Habit, on_delete=models.CASCADE, null=True, blank=True, related_name='occurrences')
+    start = models.DateTimeField()
+    end = models.DateTimeField()  # same as start for events without an end and for habits
+
+    objects = OwnedQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'start', 'end']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'start'], name='unique_event_occurrence'),
+            models.UniqueConstraint(fields=['habit', 'start'], name='unique_habit_occurrence'),
+        ]
+
+    def __str__(self):
+        return f"{self.event or self.habit} @ {self.start}"
+
+
+# The [start, end) range a user's occurrences are materialized for
+class OccurrenceHorizon(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='occurrence_horizon')
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+
+    objects = OwnedQuerySet.as_manager()
+
+    def covers(self, start, end):
+        return self.start <= start and end <= self.end
+
+    def __str__(self):
+        return f"{self.user} {self.start} - {self.end}"
+
+
+# Habit check-ins for one year stored as a day bitset: bit n is day-of-year n + 1
+class HabitLog(models.Model):
+    habit = models.ForeignKey(Habit, on_delete=models.CASCADE, related_name='logs')
+    year = models.PositiveSmallIntegerField()
+    days = models.BinaryField(default=bytes(46))  # 368 bits, enough for a leap year
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['habit', 'year'], name='unique_habit_log_year'),
+        ]
+
+    @staticmethod
+    def day_index(day):
+        return day.timetuple().tm_yday - 1
+
+    @property
+    def bits(self):
+        return int.from_bytes(bytes(self.days), 'little')
+
+    @bits.setter
+    def bits(self, value):
+        self.days = value.to_bytes(46, 'little')
+
+    def is_checked(self, day):
+        return bool(self.bits >> self.day_index(day) & 1)
+
+    def set_checked(self, day, checked=True):
+        mask = 1 << self.day_index(day)
+        self.bits = self.bits | mask if checked else self.bits & ~mask
+
+    def __str__(self):
+        return f"{self.habit} {self.year}"
+
+
+# Which shard holds a user's rows; kept on the primary, see core.sharding
+class UserShard(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='shard')
+    shard = models.CharField(max_length=50)
+
+    def __str__(self):
+        return f"{self.user} -> {self.shard}"
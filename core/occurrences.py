@@ -0,0 +1,126 @@
+from datetime import datetime, time, timedelta
+from itertools import chain, islice
+from django.db import transaction
+from django.utils import timezone
+from core.models import CalendarEvent, CalendarOccurrence, Habit, OccurrenceHorizon
+from core.recurrence import occurrences
+from core.sharding import db_for
+
+# Extra range materialized around a requested window so neighbouring views are already covered
+HORIZON_PADDING = timedelta(days=90)
+# A horizon never grows past this; a window too far away moves the horizon instead
+MAX_HORIZON = timedelta(days=3 * 365)
+BATCH_SIZE = 1000
+
+
+def _midnight(day):
+    return timezone.make_aware(datetime.combine(day, time.min), timezone.get_current_timezone())
+
+
+# Local days whose midnight falls in [start, end)
+def _day_range(start, end):
+    first_day = timezone.localtime(start).date()
+    if _midnight(first_day) < start:
+        first_day += timedelta(days=1)
+    last_day = timezone.localtime(end).date()
+    if _midnight(last_day) < end:
+        last_day += timedelta(days=1)
+    return first_day, last_day
+
+
+def _event_rows(event, start, end):
+    for occ_start, occ_end in occurrences(event.start_time, event.end_time, event.repeat,
+                                          event.repeat_until, start, end):
+        yield CalendarOccurrence(user_id=event.user_id, event=event, start=occ_start, end=occ_end or occ_start)
+
+
+def _habit_rows(habit, start, end):
+    first_day, last_day = _day_range(start, end)
+    for day in habit.occurrence_days(first_day, last_day):
+        midnight = _midnight(day)
+        yield CalendarOccurrence(user_id=habit.user_id, habit=habit, start=midnight, end=midnight)
+
+
+def _bulk_insert(rows, using):
+    # rows straddling an already materialized edge exist already, hence ignore_conflicts
+    rows = iter(rows)
+    while batch := list(islice(rows, BATCH_SIZE)):
+        CalendarOccurrence.objects.using(using).bulk_create(batch, ignore_conflicts=True)
+
+
+def _materialize(user, start, end):
+    first_day, last_day = _day_range(start, end)
+    events = CalendarEvent.objects.owned_by(user).overlapping(start, end)
+    habits = Habit.objects.owned_by(user).filter(active=True).overlapping(first_day, last_day)
+    _bulk_insert(chain(
+        chain.from_iterable(_event_rows(event, start, end) for event in events.iterator()),
+        chain.from_iterable(_habit_rows(habit, start, end) for habit in habits.iterator()),
+    ), events.db)
+
+
+# [start, end) plus as much HORIZON_PADDING as fits in MAX_HORIZON
+def _padded(start, end):
+    if end - start > MAX_HORIZON:
+        raise ValueError(f"Cannot materialize more than {MAX_HORIZON.days} days at once")
+    padding = min(HORIZON_PADDING, (MAX_HORIZON - (end - start)) / 2)
+    return start - padding, end + padding
+
+
+# Make sure every occurrence overlapping [start, end) is in the CalendarOccurrence table
+def ensure_materialized(user, start, end):
+    padded_start, padded_end = _padded(start, end)
+    horizon = OccurrenceHorizon.objects.owned_by(user).first()
+    if horizon and horizon.covers(start, end):
+        return
+
+    with transaction.atomic(using=db_for(user)):
+        horizon, created = OccurrenceHorizon.objects.owned_by(user).select_for_update().get_or_create(
+            user=user, defaults={'start': padded_start, 'end': padded_end},
+        )
+        if created:
+            _materialize(user, horizon.start, horizon.end)
+            return
+        if horizon.covers(start, end):
+            return
+
+        new_start = min(horizon.start, padded_start)
+        new_end = max(horizon.end, padded_end)
+        if new_end - new_start > MAX_HORIZON:
+            # too far from what is stored: move the horizon instead of filling the gap
+            CalendarOccurrence.objects.owned_by(user).delete()
+            new_start, new_end = padded_start, padded_end
+            _materialize(user, new_start, new_end)
+        else:
+            if new_start < horizon.start:
+                _materialize(user, new_start, horizon.start)
+            if horizon.end < new_end:
+                _materialize(user, horizon.end, new_end)
+
+        horizon.start, horizon.end = new_start, new_end
+        horizon.save()
+
+
+# Re-expand a single series after it changed; deleted series are removed by the FK cascade
+def refresh_event(event):
+    with transaction.atomic(using=event._state.db):
+        event.occurrences.all().delete()
+        horizon = OccurrenceHorizon.objects.owned_by(event.user_id).first()
+        if horizon:
+            _bulk_insert(_event_rows(event, horizon.start, horizon.end), event._state.db)
+
+
+def refresh_habit(habit):
+    with transaction.atomic(using=habit._state.db):
+        habit.occurrences.all().delete()
+        horizon = OccurrenceHorizon.objects.owned_by(habit.user_id).first()
+        if horizon and habit.active:
+            _bulk_insert(_habit_rows(habit, horizon.start, horizon.end), habit._state.db)
+
+
+# Drop and re-expand everything materialized for a user
+def rebuild(user):
+    with transaction.atomic(using=db_for(user)):
+        CalendarOccurrence.objects.owned_by(user).delete()
+        horizon = OccurrenceHorizon.objects.owned_by(user).first()
+        if horizon:
+            _materialize(user, horizon.start, horizon.end)
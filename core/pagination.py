@@ -0,0 +1,93 @@
+import base64
+import json
+from datetime import date, datetime
+from django.db.models import F, Q
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def encode_cursor(values):
+    # isoformat keeps microseconds (DjangoJSONEncoder rounds them to milliseconds)
+    values = [value.isoformat() if isinstance(value, (date, datetime)) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+# Raises ValueError for anything that isn't a cursor we produced
+def decode_cursor(cursor):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+    # encode_cursor only writes scalars; a list or object would reach the lookups as is
+    if not isinstance(values, list) or not all(value is None or isinstance(value, (str, int, float))
+                                               for value in values):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+# Rows strictly after `values` in `ordering`, e.g. ['-created_at', 'id'] gives
+# created_at < c OR (created_at = c AND id > i). Fields in `nulls_last` sort NULLs after every value.
+def _after(ordering, values, nulls_last=()):
+    after, equal = Q(), Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        if name in nulls_last:
+            if value is None:
+                equal &= Q(**{f'{name}__isnull': True})
+                continue
+            after |= equal & (Q(**{f'{name}__{lookup}': value}) | Q(**{f'{name}__isnull': True}))
+        else:
+            after |= equal & Q(**{f'{name}__{lookup}': value})
+        equal &= Q(**{name: value})
+    return after
+
+
+def _order_by(ordering, nulls_last):
+    for field in ordering:
+        name = field.lstrip('-')
+        if name not in nulls_last:
+            yield field
+        elif field.startswith('-'):
+            yield F(name).desc(nulls_last=True)
+        else:
+            yield F(name).asc(nulls_last=True)
+
+
+def get_page_size(value, default=DEFAULT_PAGE_SIZE):
+    try:
+        return max(1, min(int(value), MAX_PAGE_SIZE))
+    except (TypeError, ValueError):
+        return default
+
+
+# Cursor pagination: each page is an index range scan from the previous page's last row,
+# so page N costs the same as page 1. `ordering` must end in a unique field.
+def keyset_page(queryset, ordering, cursor=None, per_page=DEFAULT_PAGE_SIZE, nulls_last=()):
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(ordering):
+            raise ValueError("Invalid cursor")
+        try:
+            queryset = queryset.filter(_after(ordering, values, nulls_last))
+        except TypeError as e:
+            # a value of the wrong type for its field, e.g. a number for a date
+            raise ValueError("Invalid cursor") from e
+
+    rows = list(queryset.order_by(*_order_by(ordering, nulls_last))[:per_page + 1])
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = encode_cursor([getattr(rows[-1], field.lstrip('-')) for field in ordering])
+    return KeysetPage(rows, next_cursor)
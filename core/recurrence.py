@@ -0,0 +1,85 @@
+import calendar
+from datetime import datetime, timedelta
+
+# Fixed-length repeat steps; monthly repeats are calendar based and handled separately
+REPEAT_STEPS = {
+    'daily': timedelta(days=1),
+    'weekly': timedelta(weeks=1),
+}
+
+
+def is_repeating(repeat):
+    return repeat in REPEAT_STEPS or repeat == 'monthly'
+
+
+# Shift a date/datetime by a number of months, clamping the day to the end of the month
+def add_months(value, months):
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+# Start of the n-th occurrence of a series (n=0 is the series start).
+# Always computed from the anchor so monthly repeats don't drift after a short month.
+def nth_occurrence(anchor, repeat, n):
+    if repeat == 'monthly':
+        return add_months(anchor, n)
+    return anchor + REPEAT_STEPS[repeat] * n
+
+
+# Index of the first occurrence starting at or after target, without walking the series
+def first_index_on_or_after(anchor, repeat, target):
+    if target <= anchor:
+        return 0
+    if repeat == 'monthly':
+        n = (target.year - anchor.year) * 12 + target.month - anchor.month
+        if add_months(anchor, n) < target:
+            n += 1
+        return n
+    # ceil((target - anchor) / step)
+    return -((anchor - target) // REPEAT_STEPS[repeat])
+
+
+def _day(value):
+    return value.date() if isinstance(value, datetime) else value
+
+
+def occurrences(start, end=None, repeat='none', until=None, window_start=None, window_end=None):
+    """
+    Lazily yield (start, end) pairs of a series that overlap [window_start, window_end).
+
+    Works with dates (habits) and datetimes (events) as long as all arguments use the
+    same type. `until` is the last day an occurrence may start on; when both `until`
+    and `window_end` are None a repeating series is yielded forever.
+    """
+    duration = end - start if end is not None else None
+
+    if not is_repeating(repeat):
+        if window_end is not None and start >= window_end:
+            return
+        if window_start is not None and (end if end is not None else start) < window_start:
+            return
+        yield start, end
+        return
+
+    index = 0
+    if window_start is not None:
+        # first occurrence still running at window_start
+        target = window_start - duration if duration else window_start
+        index = first_index_on_or_after(start, repeat, target)
+
+    while True:
+        current = nth_occurrence(start, repeat, index)
+        if until is not None and _day(current) > until:
+            return
+        if window_end is not None and current >= window_end:
+            return
+        yield current, (current + duration if duration is not None else None)
+        index += 1
+
+
+# First occurrence starting on or after `on_or_after`, or None once the series has ended
+def next_occurrence(start, repeat='none', until=None, on_or_after=None):
+    return next(occurrences(start, None, repeat, until, window_start=on_or_after), (None,))[0]
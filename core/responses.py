@@ -0,0 +1,38 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse as BaseJsonResponse, StreamingHttpResponse
+from core.metrics import timed
+
+# Encoded items are sent in chunks of roughly this many characters
+CHUNK_SIZE = 64 * 1024
+
+
+# JSON array response that encodes items one by one from any iterable/generator,
+# so the full list and the full encoded string never have to be held in memory
+class StreamingJsonResponse(StreamingHttpResponse):
+    def __init__(self, items, encoder=DjangoJSONEncoder, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(self._encode(items, encoder), **kwargs)
+
+    @staticmethod
+    def _encode(items, encoder):
+        dumps = encoder().encode
+        buffer = ['[']
+        size = 1
+        separator = ''
+        for item in items:
+            chunk = separator + dumps(item)
+            buffer.append(chunk)
+            size += len(chunk)
+            separator = ', '
+            if size >= CHUNK_SIZE:
+                yield ''.join(buffer)
+                buffer, size = [], 0
+        buffer.append(']')
+        yield ''.join(buffer)
+
+
+# JsonResponse whose encoding time shows up in the request metrics
+class JsonResponse(BaseJsonResponse):
+    def __init__(self, *args, **kwargs):
+        with timed('serialize'):
+            super().__init__(*args, **kwargs)
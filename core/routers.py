@@ -0,0 +1,81 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+REPLICA = 'replica'
+PRIMARY = 'default'
+# Cookie marking a client that wrote recently; its reads stay on the primary until it expires
+PIN_COOKIE = 'db_pin'
+SAFE_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+
+class _Routing:
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+# Routing state of the current request, None outside ReplicaRoutingMiddleware
+_routing = ContextVar('db_routing', default=None)
+
+
+@contextmanager
+def routing(use_replica):
+    state = _routing.set(_Routing(use_replica))
+    try:
+        yield _routing.get()
+    finally:
+        _routing.reset(state)
+
+
+# Send the rest of the current request's reads to the primary. Views whose results are cached
+# or tagged under the user's current data version call this: replica reads may lag behind it.
+def use_primary():
+    state = _routing.get()
+    if state is not None:
+        state.use_replica = False
+
+
+# Reads of safe requests go to the replica, everything else to the primary. Once a request
+# writes (the feeds materialize occurrences on GET) its remaining reads use the primary too,
+# since the replica may not have the rows yet. Outside a request (commands, shell) nothing
+# is routed to the replica.
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is not None and state.use_replica and not state.wrote:
+            return REPLICA
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+# Decides per request whether reads may use the replica. A request that wrote sets PIN_COOKIE
+# for REPLICA_PIN_SECONDS, so the client's next reads (calendar.refetchEvents() after a save)
+# see its own writes. Not used unless a 'replica' database is configured.
+class ReplicaRoutingMiddleware:
+    def __init__(self, get_response):
+        if REPLICA not in settings.DATABASES:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        use_replica = request.method in SAFE_METHODS and PIN_COOKIE not in request.COOKIES
+        with routing(use_replica) as state:
+            response = self.get_response(request)
+        if state.wrote:
+            response.set_cookie(PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS,
+                                httponly=True, samesite='Lax')
+        return response
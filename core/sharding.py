@@ -0,0 +1,177 @@
+import copy
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, models, transaction
+from core.cache import bump_data_version, invalidate_cached_user
+
+SHARD_KEY = 'user-shard:{user_id}'
+
+# Models whose rows belong to one user and live in that user's shard
+SHARDED_MODELS = {
+    'core.userprofile', 'core.project', 'core.task', 'core.calendarevent', 'core.habit',
+    'core.habitlog', 'core.calendaroccurrence', 'core.occurrencehorizon',
+}
+
+
+def enabled():
+    return bool(settings.DB_SHARDS)
+
+
+# Shard a new user is placed on
+def default_shard(user_id):
+    return settings.DB_SHARDS[user_id % len(settings.DB_SHARDS)]
+
+
+# Database alias holding a user's rows, or None when sharding is off (normal routing applies).
+# Accepts a user or a user id; the directory lives on the primary and is cached.
+def shard_for(user):
+    if not settings.DB_SHARDS:
+        return None
+    user_id = getattr(user, 'pk', user)
+    key = SHARD_KEY.format(user_id=user_id)
+    alias = cache.get(key)
+    if alias is None:
+        from core.models import UserShard
+        alias = (UserShard.objects.using(DEFAULT_DB_ALIAS).filter(user_id=user_id)
+                 .values_list('shard', flat=True).first()) or default_shard(user_id)
+        cache.set(key, alias, None)
+    return alias
+
+
+# Where transactions over a user's rows have to run
+def db_for(user):
+    return shard_for(user) or DEFAULT_DB_ALIAS
+
+
+# Copy the auth_user row into the user's shard so foreign keys to it hold there.
+# Raw save, like loaddata: no validation and receivers see raw=True.
+def mirror_user(user, alias=None):
+    mirror = copy.copy(user)
+    mirror._state = copy.copy(user._state)
+    models.Model.save_base(mirror, using=alias or shard_for(user), raw=True)
+
+
+# Called for every User saved on the primary
+def user_saved(user, created, update_fields=None):
+    if created:
+        from core.models import UserShard
+        UserShard.objects.using(DEFAULT_DB_ALIAS).get_or_create(user=user, defaults={'shard': default_shard(user.pk)})
+    # a login only touches last_login, which nothing in the shard reads
+    if created or not update_fields or set(update_fields) - {'last_login'}:
+        mirror_user(user)
+
+
+# Deleting the mirror cascades to everything the user owns in the shard
+def delete_user_data(user):
+    User.objects.using(db_for(user)).filter(pk=user.pk).delete()
+
+
+# Insert a copy of `obj` on `alias` under a new id, pointing `relations` at already copied rows
+def _insert(obj, alias, **relations):
+    obj._state.db = alias
+    obj._state.adding = True
+    obj.pk = None
+    for name, value in relations.items():
+        setattr(obj, name, value)
+    models.Model.save_base(obj, using=alias, raw=True, force_insert=True)
+    return obj
+
+
+# Copy a user's rows to `target` and delete them from the current shard. Rows get new ids on the
+# target (ids are only unique per database), foreign keys are remapped. Materialized occurrences
+# are not copied; the calendar rebuilds them on the next fetch.
+# Every source row is read FOR UPDATE, starting with the user's mirror, which inserts of the
+# user's rows lock through their foreign key (tasks and logs through their project / habit).
+# Writes that arrive during the move wait for it and then fail against the deleted rows instead
+# of landing in the old shard and being lost. SQLite has no row locks, the move is unguarded there.
+def move_user(user, target):
+    from core.models import UserProfile, Project, Task, CalendarEvent, Habit, HabitLog, UserShard
+    source = db_for(user)
+    if target == source:
+        return 0
+    if target not in settings.DB_SHARDS:
+        raise ValueError(f"Unknown shard '{target}'")
+
+    copied = 0
+    with transaction.atomic(using=DEFAULT_DB_ALIAS), transaction.atomic(using=target), \
+            transaction.atomic(using=source):
+        User.objects.using(source).select_for_update().get(pk=user.pk)
+        mirror_user(user, target)
+        for profile in UserProfile.objects.using(source).select_for_update().filter(user=user):
+            _insert(profile, target)
+            copied += 1
+
+        projects = {project.pk: project for project in
+                    Project.objects.using(source).select_for_update().filter(owner=user)}
+        tasks = list(Task.objects.using(source).select_for_update(of=('self',)).filter(project__owner=user))
+        for project in projects.values():
+            _insert(project, target)
+        for task in tasks:
+            _insert(task, target, project=projects[task.project_id])
+        copied += len(projects) + len(tasks)
+
+        for event in CalendarEvent.objects.using(source).select_for_update().filter(user=user):
+            _insert(event, target)
+            copied += 1
+
+        habits = {habit.pk: habit for habit in Habit.objects.using(source).select_for_update().filter(user=user)}
+        logs = list(HabitLog.objects.using(source).select_for_update(of=('self',)).filter(habit__user=user))
+        for habit in habits.values():
+            _insert(habit, target)
+        for log in logs:
+            _insert(log, target, habit=habits[log.habit_id])
+        copied += len(habits) + len(logs)
+
+        UserShard.objects.using(DEFAULT_DB_ALIAS).update_or_create(user=user, defaults={'shard': target})
+        # the mirror's delete cascades to the source copies
+        User.objects.using(source).filter(pk=user.pk).delete()
+    cache.delete(SHARD_KEY.format(user_id=user.pk))
+    # cached feeds carry the old ids, the cached user the profile from the old shard
+    bump_data_version(user.pk)
+    invalidate_cached_user(user.pk)
+    return copied
+
+
+def _instance_db(instance):
+    # user.userprofile, user.projects...: the related rows are in the user's shard
+    if isinstance(instance, User):
+        return shard_for(instance)
+    if instance._state.db:
+        return instance._state.db
+    user_id = getattr(instance, 'owner_id', None) or getattr(instance, 'user_id', None)
+    if user_id:
+        return shard_for(user_id)
+    # e.g. a new Task: follow its project
+    for field in instance._meta.concrete_fields:
+        if field.is_relation and field.is_cached(instance):
+            related = field.get_cached_value(instance)
+            if related is not None and related._state.db:
+                return related._state.db
+    return None
+
+
+# Sends user-owned models to the user's shard, found from the instance hint (saves, related
+# managers, FK access). Queries without an instance must say where they go, which is what
+# QuerySet.owned_by(user) does. Everything else (auth, sessions, the directory) is left to the
+# next router / the primary.
+class UserShardRouter:
+    def _db(self, model, hints):
+        if model._meta.label_lower not in SHARDED_MODELS:
+            return None
+        instance = hints.get('instance')
+        return _instance_db(instance) if instance is not None else None
+
+    def db_for_read(self, model, **hints):
+        return self._db(model, hints)
+
+    def db_for_write(self, model, **hints):
+        return self._db(model, hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # users are mirrored into every shard that holds their rows
+        if isinstance(obj1, User) or isinstance(obj2, User):
+            return True
+        if {obj1._meta.label_lower, obj2._meta.label_lower} <= SHARDED_MODELS:
+            return obj1._state.db == obj2._state.db
+        return None
@@ -1,13 +1,84 @@
-from django.db.models.signals import post_save
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete, pre_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from core.models import UserProfile
+from django.contrib.auth.signals import user_logged_out
+from core import occurrences, sharding
+from core.cache import bump_data_version, invalidate_cached_user
+from core.models import UserProfile, Project, Task, CalendarEvent, Habit, HabitLog
 
 @receiver(post_save, sender=User)
-def create_user_profile(sender, instance, created, **kwargs):
+def create_user_profile(sender, instance, created, using=DEFAULT_DB_ALIAS, update_fields=None, **kwargs):
+    # saves with another alias are the user's mirror rows in a shard
+    if using != DEFAULT_DB_ALIAS:
+        return
+    if sharding.enabled():
+        sharding.user_saved(instance, created, update_fields)
     if created:
-        UserProfile.objects.create(user=instance)
+        UserProfile.objects.using(sharding.shard_for(instance)).create(user=instance)
 
+@receiver(pre_delete, sender=User)
+def delete_user_shard_data(sender, instance, using=DEFAULT_DB_ALIAS, **kwargs):
+    if using == DEFAULT_DB_ALIAS and sharding.enabled():
+        sharding.delete_user_data(instance)
+
+# drop the cached auth user (see core.backends) when it or its profile changes
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    instance.userprofile.save()
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def profile_changed(sender, instance, **kwargs):
+    invalidate_cached_user(instance.user_id)
+
+@receiver(user_logged_out)
+def user_logged_out_handler(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_cached_user(user.pk)
+
+# keep materialized occurrences in sync; deletes cascade from the series
+@receiver(post_save, sender=CalendarEvent)
+def refresh_event_occurrences(sender, instance, raw=False, **kwargs):
+    if not raw:
+        occurrences.refresh_event(instance)
+
+@receiver(post_save, sender=Habit)
+def refresh_habit_occurrences(sender, instance, raw=False, **kwargs):
+    if not raw:
+        occurrences.refresh_habit(instance)
+
+# invalidate the user's cached feeds whenever their data changes
+
+# True when a delete cascaded from one of `models`, whose own receivers already bumped the version
+def _cascaded_from(origin, *models):
+    if origin is None:
+        return False
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, models)
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def project_changed(sender, instance, **kwargs):
+    bump_data_version(instance.owner_id)
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def task_changed(sender, instance, origin=None, **kwargs):
+    if not _cascaded_from(origin, Project, User):
+        bump_data_version(instance.project.owner_id)
+
+@receiver(post_save, sender=CalendarEvent)
+@receiver(post_delete, sender=CalendarEvent)
+@receiver(post_save, sender=Habit)
+@receiver(post_delete, sender=Habit)
+def calendar_data_changed(sender, instance, **kwargs):
+    bump_data_version(instance.user_id)
+
+@receiver(post_save, sender=HabitLog)
+@receiver(post_delete, sender=HabitLog)
+def habit_log_changed(sender, instance, origin=None, **kwargs):
+    if not _cascaded_from(origin, Habit, User):
+        bump_data_version(instance.habit.user_id)
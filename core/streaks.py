@@ -0,0 +1,90 @@
+from datetime import date, timedelta
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from core.models import HabitLog
+
+
+# Check or uncheck a day; done=None flips the current state. Only scheduled days can be checked.
+def toggle_day(habit, day, done=None):
+    if not habit.is_due_on(day):
+        raise ValidationError(f"{habit.title} is not scheduled on {day.isoformat()}.")
+    with transaction.atomic(using=habit._state.db):
+        log, _ = HabitLog.objects.using(habit._state.db).select_for_update().get_or_create(habit=habit, year=day.year)
+        checked = not log.is_checked(day) if done is None else done
+        log.set_checked(day, checked)
+        log.save(update_fields=['days'])
+    return checked
+
+
+# All check-ins of a habit as one integer: bit n is the n-th day after `origin`
+def _combined_bits(habit, origin, last_day):
+    combined = 0
+    # .all() so a prefetch_related('logs') from list views is reused
+    for log in habit.logs.all():
+        if origin.year <= log.year <= last_day.year:
+            combined |= log.bits << (date(log.year, 1, 1) - origin).days
+    return combined
+
+
+# Checked flags of the habit's scheduled days up to last_day, packed in order (bit i = i-th occurrence)
+def _scheduled_checks(habit, combined, origin, last_day):
+    if last_day < habit.start_date:
+        return 0, 0
+    if habit.repeat == 'daily':
+        # every day is scheduled, so the bitmap slice is already in order
+        count = (last_day - habit.start_date).days + 1
+        return (combined >> (habit.start_date - origin).days) & ((1 << count) - 1), count
+
+    checks, count = 0, 0
+    for day in habit.occurrence_days(habit.start_date, last_day + timedelta(days=1)):
+        if combined >> (day - origin).days & 1:
+            checks |= 1 << count
+        count += 1
+    return checks, count
+
+
+def habit_streaks(habit, today):
+    origin = date(habit.start_date.year, 1, 1)
+    last_day = min(today, habit.end_date) if habit.end_date else today
+    combined = _combined_bits(habit, origin, last_day)
+    checks, count = _scheduled_checks(habit, combined, origin, last_day)
+
+    # today's occurrence still being open doesn't break the streak
+    if count and last_day == today and habit.is_due_on(today) and not checks >> (count - 1) & 1:
+        count -= 1
+        checks &= (1 << count) - 1
+
+    # current streak: run of checked occurrences ending at the latest one
+    missed = ~checks & ((1 << count) - 1)
+    current = count - missed.bit_length()
+
+    # longest streak: each shift-and removes one day from every run
+    longest, runs = 0, checks
+    while runs:
+        runs &= runs >> 1
+        longest += 1
+
+    return {
+        'current_streak': current,
+        'longest_streak': longest,
+        'total_checked': combined.bit_count(),
+    }
+
+
+# One character per day of the year: '1' when checked / scheduled
+def habit_heatmap(habit, year):
+    first_day, next_year = date(year, 1, 1), date(year + 1, 1, 1)
+    days = (next_year - first_day).days
+    log = habit.logs.filter(year=year).first()
+    bits = log.bits & ((1 << days) - 1) if log else 0
+
+    scheduled = 0
+    for day in habit.occurrence_days(first_day, next_year):
+        scheduled |= 1 << HabitLog.day_index(day)
+
+    return {
+        'year': year,
+        'checked': format(bits, f'0{days}b')[::-1],
+        'scheduled': format(scheduled, f'0{days}b')[::-1],
+        'total_checked': bits.bit_count(),
+    }
@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from core.cache import get_cached_user
+from core.checks import check_shared_cache
+
+CACHED_DB = 'django.contrib.sessions.backends.cached_db'
+
+
+class LogoutTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('alice', password='pw')
+
+    def setUp(self):
+        cache.clear()
+
+    # a second client holding the same cookie stands in for another tab or device
+    def _logged_in_pair(self):
+        client = Client()
+        self.assertTrue(client.login(username='alice', password='pw'))
+        other = Client()
+        other.cookies[settings.SESSION_COOKIE_NAME] = client.cookies[settings.SESSION_COOKIE_NAME].value
+        self.assertEqual(other.get(reverse('dashboard')).status_code, 200)
+        return client, other
+
+    def test_logout_ends_the_session(self):
+        client, other = self._logged_in_pair()
+        client.post(reverse('logout'))
+        response = other.get(reverse('dashboard'))
+        self.assertRedirects(response, f"{reverse('login')}?next={reverse('dashboard')}")
+
+    @override_settings(SHARED_CACHE=True, SESSION_ENGINE=CACHED_DB, AUTH_USER_CACHE_TIMEOUT=300)
+    def test_logout_ends_a_cached_session_and_drops_the_cached_user(self):
+        client, other = self._logged_in_pair()
+        self.assertIsNotNone(get_cached_user(self.user.pk))
+        client.post(reverse('logout'))
+        self.assertIsNone(get_cached_user(self.user.pk))
+        self.assertEqual(other.get(reverse('dashboard')).status_code, 302)
+
+    def test_defaults_without_a_shared_cache_keep_nothing_in_it(self):
+        client, _ = self._logged_in_pair()
+        self.assertIsNone(get_cached_user(self.user.pk))
+
+
+class SharedCacheCheckTests(TestCase):
+    @override_settings(SHARED_CACHE=False, SESSION_ENGINE=CACHED_DB, AUTH_USER_CACHE_TIMEOUT=300)
+    def test_per_process_cache_rejects_cached_sessions_and_users(self):
+        self.assertEqual([error.id for error in check_shared_cache(None)], ['core.E001', 'core.E002'])
+
+    @override_settings(SHARED_CACHE=True, SESSION_ENGINE=CACHED_DB, AUTH_USER_CACHE_TIMEOUT=300)
+    def test_shared_cache_allows_them(self):
+        self.assertEqual(check_shared_cache(None), [])
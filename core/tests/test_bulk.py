@@ -0,0 +1,78 @@
+import json
+from datetime import date
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from core.cache import get_data_version
+from core.models import Project, Task
+
+
+class BulkTasksTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('alice', password='pw')
+        cls.project = Project.objects.create(owner=cls.user, title='P', due_date=date(2030, 1, 1))
+        cls.other_project = Project.objects.create(owner=cls.user, title='Q', due_date=date(2030, 1, 1))
+        cls.tasks = [Task.objects.create(project=cls.project, title=f'T{n}') for n in range(3)]
+        cls.ids = [task.pk for task in cls.tasks]
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def _post(self, body):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse('bulk_tasks'), json.dumps(body), content_type='application/json')
+
+    def _version_change(self, body):
+        before = get_data_version(self.user.pk)
+        response = self._post(body)
+        return response, get_data_version(self.user.pk) - before
+
+    def test_complete(self):
+        response, bumped = self._version_change({'action': 'complete', 'ids': self.ids})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['result'] for r in response.json()['results']], ['updated'] * 3)
+        self.assertEqual(Task.objects.filter(pk__in=self.ids, status='completed', is_done=True).count(), 3)
+        self.assertEqual(bumped, 1)
+
+    def test_move(self):
+        response = self._post({'action': 'move', 'ids': self.ids[:2], 'project': self.other_project.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Task.objects.filter(project=self.other_project).count(), 2)
+
+    def test_delete_bumps_the_version_once_after_commit(self):
+        before = get_data_version(self.user.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(reverse('bulk_tasks'), json.dumps({'action': 'delete', 'ids': self.ids}),
+                                        content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Task.objects.filter(pk__in=self.ids).exists())
+        self.assertEqual(get_data_version(self.user.pk), before)
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertEqual(get_data_version(self.user.pk), before + 1)
+
+    def test_mixed_ownership_is_not_found_and_changes_nothing(self):
+        other = User.objects.create_user('bob', password='pw')
+        project = Project.objects.create(owner=other, title='Theirs', due_date=date(2030, 1, 1))
+        theirs = Task.objects.create(project=project, title='Theirs')
+        for action in ('complete', 'delete'):
+            with self.subTest(action=action):
+                response, bumped = self._version_change({'action': action, 'ids': [*self.ids, theirs.pk]})
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(bumped, 0)
+        self.assertEqual(Task.objects.filter(pk__in=[*self.ids, theirs.pk], status='pending').count(), 4)
+
+    def test_unknown_ids_are_not_found(self):
+        response = self._post({'action': 'complete', 'ids': [self.ids[0], 999999]})
+        self.assertEqual(response.status_code, 404)
+        self.assertIn('999999', response.json()['message'])
+
+    def test_invalid_requests(self):
+        for body in ({'action': 'explode', 'ids': self.ids}, {'action': 'complete', 'ids': []},
+                     {'action': 'complete', 'ids': ['x']}, {'action': 'reprioritize', 'ids': self.ids},
+                     {'action': 'move', 'ids': self.ids, 'project': 999999}, [self.ids]):
+            with self.subTest(body=body):
+                self.assertEqual(self._post(body).status_code, 400)
@@ -0,0 +1,111 @@
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from core.cache import user_data_etag
+from core.models import Project, CalendarEvent, CalendarOccurrence, OccurrenceHorizon
+from core.occurrences import HORIZON_PADDING, MAX_HORIZON, ensure_materialized
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+class ProjectsJsonTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('alice', password='pw')
+        Project.objects.create(owner=cls.user, title='Soon', due_date=date(2030, 1, 15))
+        past = Project.objects.create(owner=cls.user, title='Past', due_date=date(2030, 1, 15))
+        # created_at is auto_now_add; update() skips it and the model validation
+        Project.objects.filter(pk=past.pk).update(created_at=utc(2019, 1, 1), due_date=date(2019, 2, 1))
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def _titles(self, params=None):
+        return sorted(p['title'] for p in self.client.get(reverse('projects-json'), params or {}).json())
+
+    def test_no_params_lists_every_project(self):
+        self.assertEqual(self._titles(), ['Past', 'Soon'])
+
+    def test_bounds_filter_each_side(self):
+        self.assertEqual(self._titles({'start': '2025-01-01'}), ['Soon'])
+        self.assertEqual(self._titles({'end': '2020-01-01'}), ['Past'])
+        self.assertEqual(self._titles({'start': '2019-01-15', 'end': '2019-03-01'}), ['Past'])
+
+
+@override_settings(SHARED_CACHE=True)
+class OpenWindowKeyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('alice', password='pw')
+
+    def _etag(self, query, today):
+        request = RequestFactory().get('/api/calendar/feed/', query)
+        request.user = self.user
+        with mock.patch('django.utils.timezone.localdate', return_value=today):
+            return user_data_etag(request)
+
+    def test_open_windows_are_keyed_by_day(self):
+        self.assertNotEqual(self._etag({}, date(2030, 1, 1)), self._etag({}, date(2030, 1, 2)))
+        self.assertNotEqual(self._etag({'start': '2030-01-01'}, date(2030, 1, 1)),
+                            self._etag({'start': '2030-01-01'}, date(2030, 1, 2)))
+
+    def test_closed_windows_are_not(self):
+        window = {'start': '2030-01-01', 'end': '2030-02-01'}
+        self.assertEqual(self._etag(window, date(2030, 1, 1)), self._etag(window, date(2030, 1, 2)))
+
+
+class MaterializationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='pw')
+        self.event = CalendarEvent.objects.create(user=self.user, title='Standup', start_time=utc(2030, 1, 1, 9),
+                                                  end_time=utc(2030, 1, 1, 10), repeat='daily')
+
+    def _starts(self, start, end):
+        return list(CalendarOccurrence.objects.filter(event=self.event, start__gte=start, start__lt=end)
+                    .order_by('start').values_list('start', flat=True))
+
+    def test_window_is_materialized_with_padding(self):
+        ensure_materialized(self.user, utc(2030, 1, 1), utc(2030, 1, 8))
+        self.assertEqual(len(self._starts(utc(2030, 1, 1), utc(2030, 1, 8))), 7)
+        horizon = OccurrenceHorizon.objects.get(user=self.user)
+        self.assertEqual(horizon.end, utc(2030, 1, 8) + HORIZON_PADDING)
+
+    def test_editing_a_series_rematerializes_it(self):
+        ensure_materialized(self.user, utc(2030, 1, 1), utc(2030, 1, 8))
+        self.event.start_time, self.event.end_time = utc(2030, 1, 1, 14), utc(2030, 1, 1, 15)
+        self.event.repeat_until = date(2030, 1, 3)
+        self.event.save()
+        self.assertEqual(self._starts(utc(2030, 1, 1), utc(2031, 1, 1)),
+                         [utc(2030, 1, 1, 14), utc(2030, 1, 2, 14), utc(2030, 1, 3, 14)])
+
+    def test_deleting_a_series_removes_its_occurrences(self):
+        ensure_materialized(self.user, utc(2030, 1, 1), utc(2030, 1, 8))
+        self.event.delete()
+        self.assertFalse(CalendarOccurrence.objects.filter(user=self.user).exists())
+
+    def test_horizon_extends_to_a_later_window(self):
+        ensure_materialized(self.user, utc(2030, 1, 1), utc(2030, 1, 8))
+        horizon = OccurrenceHorizon.objects.get(user=self.user)
+        later = horizon.end + timedelta(days=30)
+        ensure_materialized(self.user, later, later + timedelta(days=7))
+        horizon.refresh_from_db()
+        self.assertEqual(horizon.start, utc(2030, 1, 1) - HORIZON_PADDING)
+        self.assertEqual(horizon.end, later + timedelta(days=7) + HORIZON_PADDING)
+        # the gap between the two windows is filled: one standup a day from the first one on
+        self.assertEqual(CalendarOccurrence.objects.filter(event=self.event).count(),
+                         (horizon.end - utc(2030, 1, 1)).days)
+
+    def test_a_far_window_moves_the_horizon(self):
+        ensure_materialized(self.user, utc(2030, 1, 1), utc(2030, 1, 8))
+        far = utc(2030, 1, 1) + MAX_HORIZON * 2
+        ensure_materialized(self.user, far, far + timedelta(days=7))
+        horizon = OccurrenceHorizon.objects.get(user=self.user)
+        self.assertEqual(horizon.start, far - HORIZON_PADDING)
+        self.assertFalse(CalendarOccurrence.objects.filter(event=self.event, start__lt=horizon.start).exists())
+        self.assertEqual(len(self._starts(far, far + timedelta(days=7))), 7)
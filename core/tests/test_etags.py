@@ -0,0 +1,46 @@
+from datetime import date
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from core.models import Project
+
+WINDOW = {'start': '2030-01-01', 'end': '2030-03-01'}
+
+
+@override_settings(SHARED_CACHE=True)
+class UserDataEtagTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('alice', password='pw')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        self.url = reverse('projects-json')
+
+    def test_matching_etag_is_answered_with_304(self):
+        first = self.client.get(self.url, WINDOW)
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first.has_header('ETag'))
+        again = self.client.get(self.url, WINDOW, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again.status_code, 304)
+
+    def test_write_changes_the_etag(self):
+        first = self.client.get(self.url, WINDOW)
+        Project.objects.create(owner=self.user, title='New', due_date=date(2030, 2, 1))
+        after = self.client.get(self.url, WINDOW, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(after.status_code, 200)
+        self.assertNotEqual(after['ETag'], first['ETag'])
+        self.assertEqual([p['title'] for p in after.json()], ['New'])
+
+    def test_other_windows_get_other_etags(self):
+        first = self.client.get(self.url, WINDOW)
+        other = self.client.get(self.url, {**WINDOW, 'end': '2030-04-01'})
+        self.assertNotEqual(first['ETag'], other['ETag'])
+
+    @override_settings(SHARED_CACHE=False)
+    def test_no_etag_without_a_shared_cache(self):
+        response = self.client.get(self.url, WINDOW)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
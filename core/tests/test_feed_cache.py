@@ -0,0 +1,88 @@
+from datetime import date, datetime, timezone as dt_timezone
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from core.cache import get_data_version
+from core.dashboard import get_dashboard
+from core.models import Project, Task, CalendarEvent, Habit, HabitLog
+
+WINDOW = {'start': '2030-01-01', 'end': '2030-03-01'}
+
+
+class DataVersionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('alice', password='pw')
+
+    def setUp(self):
+        cache.clear()
+
+    def assertBumps(self, action):
+        before = get_data_version(self.user.pk)
+        result = action()
+        self.assertGreater(get_data_version(self.user.pk), before)
+        return result
+
+    def test_project_and_task_saves_and_deletes_bump(self):
+        project = self.assertBumps(lambda: Project.objects.create(owner=self.user, title='P'))
+        task = self.assertBumps(lambda: Task.objects.create(project=project, title='T'))
+        task.title = 'T2'
+        self.assertBumps(task.save)
+        self.assertBumps(task.delete)
+        self.assertBumps(project.delete)
+
+    def test_event_habit_and_log_changes_bump(self):
+        start = datetime(2030, 1, 1, 9, tzinfo=dt_timezone.utc)
+        event = self.assertBumps(lambda: CalendarEvent.objects.create(user=self.user, title='E', start_time=start))
+        habit = self.assertBumps(lambda: Habit.objects.create(user=self.user, title='H', start_date=date(2030, 1, 1)))
+        log = self.assertBumps(lambda: HabitLog.objects.create(habit=habit, year=2030))
+        self.assertBumps(log.delete)
+        self.assertBumps(habit.delete)
+        self.assertBumps(event.delete)
+
+    def test_other_users_are_not_bumped(self):
+        other = User.objects.create_user('bob', password='pw')
+        before = get_data_version(other.pk)
+        Project.objects.create(owner=self.user, title='P')
+        self.assertEqual(get_data_version(other.pk), before)
+
+
+@override_settings(SHARED_CACHE=True)
+class CachedFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('alice', password='pw')
+        cls.project = Project.objects.create(owner=cls.user, title='Old', due_date=date(2030, 2, 1))
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def _titles(self):
+        return [p['title'] for p in self.client.get(reverse('projects-json'), WINDOW).json()]
+
+    def test_feed_is_served_from_cache_until_a_write(self):
+        self.assertEqual(self._titles(), ['Old'])
+        # update() skips the signals, so the cached body stays
+        Project.objects.filter(pk=self.project.pk).update(title='Sneaky')
+        self.assertEqual(self._titles(), ['Old'])
+        project = Project.objects.get(pk=self.project.pk)
+        project.title = 'New'
+        project.save()
+        self.assertEqual(self._titles(), ['New'])
+
+    def test_dashboard_is_cached_until_a_write(self):
+        self.assertEqual(get_dashboard(self.user)['project_count'], 1)
+        Project.objects.bulk_create([Project(owner=self.user, title='Bulk')])
+        self.assertEqual(get_dashboard(self.user)['project_count'], 1)
+        Project.objects.create(owner=self.user, title='Saved')
+        self.assertEqual(get_dashboard(self.user)['project_count'], 3)
+
+    @override_settings(SHARED_CACHE=False)
+    def test_nothing_is_cached_without_a_shared_cache(self):
+        self.assertEqual(self._titles(), ['Old'])
+        Project.objects.filter(pk=self.project.pk).update(title='Direct')
+        self.assertEqual(self._titles(), ['Direct'])
+        Project.objects.bulk_create([Project(owner=self.user, title='Bulk')])
+        self.assertEqual(get_dashboard(self.user)['project_count'], 2)
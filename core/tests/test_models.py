@@ -0,0 +1,59 @@
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from core.forms import ProjectForm, TaskForm
+from core.models import Project, Task
+
+
+class ValidatedModelTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner', password='pw')
+        cls.project = Project.objects.create(owner=cls.user, title='Existing')
+
+    def test_model_form_create_is_one_write(self):
+        form = ProjectForm({'title': 'New', 'description': ''})
+        self.assertTrue(form.is_valid())
+        form.instance.owner = self.user
+        with self.assertNumQueries(1):
+            form.save()
+
+    def test_model_form_create_with_attached_relation_is_one_write(self):
+        form = TaskForm({'title': 'Task', 'description': '', 'status': 'pending', 'priority': 'low'})
+        self.assertTrue(form.is_valid())
+        form.instance.project = self.project
+        with self.assertNumQueries(1):
+            form.save()
+
+    def test_model_form_update_is_one_write(self):
+        form = ProjectForm({'title': 'Renamed', 'description': 'x'}, instance=Project.objects.get(pk=self.project.pk))
+        self.assertTrue(form.is_valid())
+        with self.assertNumQueries(1):
+            form.save()
+
+    def test_unchanged_resave_skips_validation(self):
+        project = Project.objects.get(pk=self.project.pk)
+        project.full_clean()
+        with self.assertNumQueries(1):
+            project.save()
+
+    def test_field_changed_after_full_clean_is_revalidated(self):
+        project = Project.objects.get(pk=self.project.pk)
+        project.full_clean()
+        project.title = 'x' * 201
+        with self.assertRaises(ValidationError) as ctx:
+            project.save()
+        self.assertIn('title', ctx.exception.message_dict)
+
+    def test_invalid_direct_save_raises(self):
+        with self.assertRaises(ValidationError):
+            Project(owner=self.user, title='').save()
+        self.assertFalse(Project.objects.filter(title='').exists())
+
+    def test_save_without_validation(self):
+        project = Project(owner=self.user, title='')
+        project.save(validate=False)
+        self.assertTrue(Project.objects.filter(pk=project.pk, title='').exists())
+        task = Task(project=self.project, title='')
+        task.save(validate=False)
+        self.assertEqual(Task.objects.get(pk=task.pk).title, '')
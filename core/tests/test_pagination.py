@@ -0,0 +1,94 @@
+import base64
+import json
+from datetime import date, datetime, timezone as dt_timezone
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from core.models import Project, Task
+from core.pagination import decode_cursor, encode_cursor, keyset_page
+
+PROJECT_ORDERING = ['-created_at', 'id']
+TASK_ORDERING = ['due_date', 'id']
+
+
+def crafted(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+class CursorTests(SimpleTestCase):
+    def test_round_trip_keeps_microseconds(self):
+        created = datetime(2030, 1, 1, 9, 30, 0, 123456, tzinfo=dt_timezone.utc)
+        self.assertEqual(decode_cursor(encode_cursor([created, 7])), [created.isoformat(), 7])
+
+    def test_rejects_anything_we_did_not_produce(self):
+        for cursor in ('not base64!', crafted({'a': 1}), crafted(5), crafted([{'a': 1}, 1]), crafted([[1], 1])):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(ValueError):
+                    decode_cursor(cursor)
+
+
+class KeysetPageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('alice', password='pw')
+        cls.projects = [Project.objects.create(owner=cls.user, title=f'P{n}', due_date=date(2030, 1, 1))
+                        for n in range(7)]
+        # ties on created_at, broken by id
+        tied = datetime(2029, 6, 1, tzinfo=dt_timezone.utc)
+        Project.objects.filter(pk__in=[p.pk for p in cls.projects[:4]]).update(created_at=tied)
+        due_dates = [date(2030, 3, 1), None, date(2030, 2, 1), None, date(2030, 2, 1), date(2030, 1, 1)]
+        cls.tasks = [Task.objects.create(project=cls.projects[0], title=f'T{n}', due_date=due)
+                     for n, due in enumerate(due_dates)]
+
+    def _walk(self, queryset, ordering, per_page, **kwargs):
+        seen, cursor = [], None
+        while True:
+            page = keyset_page(queryset, ordering, cursor, per_page, **kwargs)
+            seen.extend(obj.pk for obj in page.object_list)
+            if not page.has_next:
+                return seen
+            cursor = page.next_cursor
+
+    def test_pages_have_no_overlap_or_gaps(self):
+        projects = Project.objects.owned_by(self.user)
+        expected = list(projects.order_by(*PROJECT_ORDERING).values_list('pk', flat=True))
+        for per_page in (1, 2, 3, 7, 8):
+            with self.subTest(per_page=per_page):
+                self.assertEqual(self._walk(projects, PROJECT_ORDERING, per_page), expected)
+
+    def test_nulls_last_ordering(self):
+        tasks = Task.objects.filter(project=self.projects[0])
+        t = [task.pk for task in self.tasks]
+        expected = [t[5], t[2], t[4], t[0], t[1], t[3]]
+        for per_page in (1, 2, 4, 6):
+            with self.subTest(per_page=per_page):
+                self.assertEqual(self._walk(tasks, TASK_ORDERING, per_page, nulls_last={'due_date'}), expected)
+
+    def test_cursor_of_the_wrong_length_or_types(self):
+        projects = Project.objects.owned_by(self.user)
+        for values in ([1], [1, 1], [{'a': 1}, 1]):
+            with self.subTest(values=values):
+                with self.assertRaises(ValueError):
+                    keyset_page(projects, PROJECT_ORDERING, crafted(values))
+
+
+class PageViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('alice', password='pw')
+        cls.project = Project.objects.create(owner=cls.user, title='P', due_date=date(2030, 1, 1))
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_crafted_cursors_are_a_bad_request(self):
+        for values in ([{'a': 1}, 1], [1, 1], ['x', 'y'], [None, None]):
+            with self.subTest(values=values):
+                response = self.client.get(reverse('projects-page-json'), {'cursor': crafted(values)})
+                self.assertEqual(response.status_code, 400)
+
+    def test_html_lists_fall_back_to_the_first_page(self):
+        cursor = crafted([{'a': 1}, 1])
+        self.assertEqual(self.client.get(reverse('project_list'), {'cursor': cursor}).status_code, 200)
+        url = reverse('project_detail', args=[self.project.pk])
+        self.assertEqual(self.client.get(url, {'cursor': cursor}).status_code, 200)
@@ -0,0 +1,70 @@
+from datetime import date, datetime, timedelta
+from django.test import SimpleTestCase
+from core.recurrence import first_index_on_or_after, next_occurrence, occurrences
+
+
+def _starts(*args, **kwargs):
+    return [start for start, _ in occurrences(*args, **kwargs)]
+
+
+class FirstIndexOnOrAfterTests(SimpleTestCase):
+    def test_target_before_anchor_is_first_occurrence(self):
+        self.assertEqual(first_index_on_or_after(date(2025, 1, 10), 'daily', date(2024, 12, 1)), 0)
+
+    def test_fixed_steps_round_up(self):
+        anchor = datetime(2025, 1, 1, 9)
+        self.assertEqual(first_index_on_or_after(anchor, 'daily', datetime(2025, 1, 11, 9)), 10)
+        self.assertEqual(first_index_on_or_after(anchor, 'daily', datetime(2025, 1, 11, 9, 1)), 11)
+        self.assertEqual(first_index_on_or_after(anchor, 'weekly', datetime(2025, 1, 9)), 2)
+
+    def test_monthly_clamped_occurrence_before_target_moves_on(self):
+        # the 1st monthly occurrence of Jan 31 is Feb 28, before the target
+        self.assertEqual(first_index_on_or_after(date(2025, 1, 31), 'monthly', date(2025, 3, 1)), 2)
+        self.assertEqual(first_index_on_or_after(date(2025, 1, 31), 'monthly', date(2025, 2, 28)), 1)
+
+    def test_far_target_does_not_walk_the_series(self):
+        self.assertEqual(first_index_on_or_after(date(2000, 1, 1), 'daily', date(2100, 1, 1)),
+                         (date(2100, 1, 1) - date(2000, 1, 1)).days)
+
+
+class OccurrencesTests(SimpleTestCase):
+    def test_monthly_clamps_to_month_end_without_drifting(self):
+        starts = _starts(date(2024, 1, 31), repeat='monthly', window_end=date(2024, 6, 1))
+        self.assertEqual(starts, [date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31),
+                                  date(2024, 4, 30), date(2024, 5, 31)])
+
+    def test_window_starting_mid_occurrence_includes_the_running_one(self):
+        start = datetime(2025, 1, 1, 23)
+        pairs = list(occurrences(start, start + timedelta(hours=2), 'daily',
+                                 window_start=datetime(2025, 1, 5, 0), window_end=datetime(2025, 1, 6, 0)))
+        self.assertEqual(pairs, [(datetime(2025, 1, 4, 23), datetime(2025, 1, 5, 1)),
+                                 (datetime(2025, 1, 5, 23), datetime(2025, 1, 6, 1))])
+
+    def test_until_is_the_last_start_day(self):
+        starts = _starts(datetime(2025, 1, 1, 9), repeat='daily', until=date(2025, 1, 3))
+        self.assertEqual(starts, [datetime(2025, 1, 1, 9), datetime(2025, 1, 2, 9), datetime(2025, 1, 3, 9)])
+
+    def test_until_before_window_yields_nothing(self):
+        self.assertEqual(_starts(date(2025, 1, 1), repeat='weekly', until=date(2025, 2, 1),
+                                 window_start=date(2025, 3, 1), window_end=date(2025, 4, 1)), [])
+
+    def test_open_ended_series_is_lazy(self):
+        series = occurrences(date(2025, 1, 1), repeat='daily')
+        self.assertEqual([next(series)[0] for _ in range(3)],
+                         [date(2025, 1, 1), date(2025, 1, 2), date(2025, 1, 3)])
+
+    def test_non_repeating_edges(self):
+        start, end = datetime(2025, 1, 1, 9), datetime(2025, 1, 1, 10)
+        window = {'window_start': datetime(2025, 1, 1, 10), 'window_end': datetime(2025, 1, 2)}
+        # ending exactly at the window start still counts, starting at the window end does not
+        self.assertEqual(list(occurrences(start, end, **window)), [(start, end)])
+        self.assertEqual(list(occurrences(start, end, window_start=datetime(2025, 1, 1, 10, 1))), [])
+        self.assertEqual(list(occurrences(start, end, window_end=start)), [])
+        self.assertEqual(list(occurrences(start, None, window_start=start, window_end=end)), [(start, None)])
+        self.assertEqual(list(occurrences(start, None, window_start=datetime(2025, 1, 1, 9, 1))), [])
+
+    def test_next_occurrence(self):
+        self.assertEqual(next_occurrence(date(2025, 1, 1), 'weekly', on_or_after=date(2025, 1, 9)), date(2025, 1, 15))
+        self.assertIsNone(next_occurrence(date(2025, 1, 1), 'weekly', until=date(2025, 1, 14),
+                                          on_or_after=date(2025, 1, 9)))
+        self.assertIsNone(next_occurrence(date(2025, 1, 1), 'none', on_or_after=date(2025, 1, 2)))
@@ -0,0 +1,102 @@
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from core import routers
+from core.cache import user_data_etag
+from core.models import Project
+from core.routers import PIN_COOKIE, PRIMARY, REPLICA, ReadReplicaRouter, ReplicaRoutingMiddleware, routing
+
+router = ReadReplicaRouter()
+
+
+class ReadReplicaRouterTests(SimpleTestCase):
+    def test_reads_outside_a_request_use_the_primary(self):
+        self.assertEqual(router.db_for_read(Project), PRIMARY)
+
+    def test_safe_reads_use_the_replica_until_a_write(self):
+        with routing(True):
+            self.assertEqual(router.db_for_read(Project), REPLICA)
+            self.assertEqual(router.db_for_write(Project), PRIMARY)
+            self.assertEqual(router.db_for_read(Project), PRIMARY)
+
+    def test_unsafe_requests_read_the_primary(self):
+        with routing(False):
+            self.assertEqual(router.db_for_read(Project), PRIMARY)
+
+    def test_use_primary_moves_the_remaining_reads(self):
+        with routing(True):
+            routers.use_primary()
+            self.assertEqual(router.db_for_read(Project), PRIMARY)
+
+    def test_relations_allowed_and_migrations_only_on_the_primary(self):
+        self.assertTrue(router.allow_relation(Project(), Project()))
+        self.assertTrue(router.allow_migrate(PRIMARY, 'core'))
+        self.assertFalse(router.allow_migrate(REPLICA, 'core'))
+
+
+# The middleware only checks that a 'replica' alias exists, no connection is opened
+@mock.patch.object(routers.settings, 'DATABASES', {PRIMARY: {}, REPLICA: {}})
+@override_settings(REPLICA_PIN_SECONDS=5)
+class ReplicaRoutingMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _run(self, request, write=False):
+        seen = []
+
+        def view(request):
+            seen.append(router.db_for_read(Project))
+            if write:
+                router.db_for_write(Project)
+                seen.append(router.db_for_read(Project))
+            return HttpResponse()
+        return ReplicaRoutingMiddleware(view)(request), seen
+
+    def test_safe_unpinned_reads_use_the_replica(self):
+        response, seen = self._run(self.factory.get('/'))
+        self.assertEqual(seen, [REPLICA])
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_a_write_pins_the_client_to_the_primary(self):
+        response, seen = self._run(self.factory.post('/'), write=True)
+        self.assertEqual(seen, [PRIMARY, PRIMARY])
+        self.assertEqual(response.cookies[PIN_COOKIE]['max-age'], 5)
+
+    def test_a_get_that_writes_reads_the_primary_afterwards_and_pins(self):
+        response, seen = self._run(self.factory.get('/'), write=True)
+        self.assertEqual(seen, [REPLICA, PRIMARY])
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+    def test_pinned_clients_read_the_primary(self):
+        request = self.factory.get('/')
+        request.COOKIES[PIN_COOKIE] = '1'
+        _, seen = self._run(request)
+        self.assertEqual(seen, [PRIMARY])
+
+    def test_not_used_without_a_replica(self):
+        with mock.patch.object(routers.settings, 'DATABASES', {PRIMARY: {}}):
+            with self.assertRaises(MiddlewareNotUsed):
+                ReplicaRoutingMiddleware(lambda request: HttpResponse())
+
+
+@override_settings(SHARED_CACHE=True)
+class CachedViewRoutingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get('/')
+        self.request.user = User.objects.create_user('alice', password='pw')
+
+    # tags and cache entries belong to the current data version, which only the primary has surely reached
+    def test_an_etag_moves_the_request_to_the_primary(self):
+        with routing(True):
+            self.assertIsNotNone(user_data_etag(self.request))
+            self.assertEqual(router.db_for_read(Project), PRIMARY)
+
+    @override_settings(SHARED_CACHE=False)
+    def test_uncached_requests_keep_the_replica(self):
+        with routing(True):
+            self.assertIsNone(user_data_etag(self.request))
+            self.assertEqual(router.db_for_read(Project), REPLICA)
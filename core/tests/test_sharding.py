@@ -0,0 +1,126 @@
+from datetime import date, datetime, timezone as dt_timezone
+from unittest import skipUnless
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from core import sharding
+from core.models import (UserProfile, Project, Task, CalendarEvent, Habit, HabitLog, UserShard,
+                         OccurrenceHorizon)
+
+router = sharding.UserShardRouter()
+SHARDS = ['shard_0', 'shard_1']
+
+
+class ShardForTests(TestCase):
+    databases = '__all__'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('alice', password='pw')
+
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(DB_SHARDS=[])
+    def test_off_without_shards(self):
+        self.assertIsNone(sharding.shard_for(self.user))
+        self.assertEqual(sharding.db_for(self.user), 'default')
+
+    @override_settings(DB_SHARDS=SHARDS)
+    def test_users_without_a_directory_entry_get_the_default_shard(self):
+        self.assertEqual(sharding.shard_for(4), 'shard_0')
+        self.assertEqual(sharding.shard_for(5), 'shard_1')
+
+    @override_settings(DB_SHARDS=SHARDS)
+    def test_directory_entry_wins_and_is_cached(self):
+        expected = next(alias for alias in SHARDS if alias != sharding.default_shard(self.user.pk))
+        UserShard.objects.update_or_create(user=self.user, defaults={'shard': expected})
+        self.assertEqual(sharding.shard_for(self.user), expected)
+        UserShard.objects.filter(user=self.user).update(shard='elsewhere')
+        with self.assertNumQueries(0):
+            self.assertEqual(sharding.shard_for(self.user.pk), expected)
+
+
+class UserShardRouterTests(TestCase):
+    databases = '__all__'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('alice', password='pw')
+        UserShard.objects.update_or_create(user=cls.user, defaults={'shard': 'shard_1'})
+
+    def setUp(self):
+        cache.clear()
+        # only the routing decisions are under test, no shard database is touched
+        self.enterContext(override_settings(DB_SHARDS=SHARDS))
+
+    def test_unsharded_models_are_left_to_the_next_router(self):
+        self.assertIsNone(router.db_for_read(User, instance=self.user))
+        self.assertIsNone(router.db_for_write(UserShard))
+
+    def test_queries_without_an_instance_are_not_routed(self):
+        self.assertIsNone(router.db_for_read(Project))
+
+    def test_instances_follow_their_database_user_or_project(self):
+        self.assertEqual(router.db_for_write(Project, instance=Project(owner_id=self.user.pk)), 'shard_1')
+        self.assertEqual(router.db_for_read(UserProfile, instance=self.user), 'shard_1')
+        project = Project(owner_id=self.user.pk)
+        project._state.db = 'shard_0'
+        self.assertEqual(router.db_for_read(Project, instance=project), 'shard_0')
+        task = Task(project=project)
+        # assigning the project already asked the configured routers, ask this one
+        task._state.db = None
+        self.assertEqual(router.db_for_write(Task, instance=task), 'shard_0')
+
+    def test_relations(self):
+        here, there = Project(owner=self.user), Project(owner=self.user)
+        here._state.db, there._state.db = 'shard_0', 'shard_1'
+        self.assertTrue(router.allow_relation(self.user, here))
+        self.assertFalse(router.allow_relation(here, there))
+        self.assertTrue(router.allow_relation(here, Task(project=here)))
+        self.assertIsNone(router.allow_relation(UserShard(), UserShard()))
+
+
+@skipUnless(len(settings.DB_SHARDS) >= 2, "needs two or more shards (DB_SHARD_COUNT)")
+class MoveUserTests(TestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('alice', password='pw')
+        self.source = sharding.shard_for(self.user)
+        self.target = next(alias for alias in settings.DB_SHARDS if alias != self.source)
+        # create() gives the router no instance, so the shard is named as in the app
+        project = Project.objects.using(self.source).create(owner=self.user, title='P', due_date=date(2030, 1, 1))
+        Task.objects.using(self.source).create(project=project, title='T1')
+        Task.objects.using(self.source).create(project=project, title='T2')
+        start = datetime(2030, 1, 1, 9, tzinfo=dt_timezone.utc)
+        CalendarEvent.objects.using(self.source).create(user=self.user, title='E', start_time=start)
+        habit = Habit.objects.using(self.source).create(user=self.user, title='H', start_date=date(2030, 1, 1))
+        HabitLog.objects.using(self.source).create(habit=habit, year=2030)
+        # not copied, rebuilt on the next fetch
+        OccurrenceHorizon.objects.using(self.source).create(user=self.user, start=start, end=start)
+
+    def test_moves_every_row_and_remaps_foreign_keys(self):
+        # profile, project, 2 tasks, event, habit, log
+        self.assertEqual(sharding.move_user(self.user, self.target), 7)
+        self.assertEqual(sharding.shard_for(self.user), self.target)
+        self.assertEqual(UserShard.objects.get(user=self.user).shard, self.target)
+
+        project = Project.objects.owned_by(self.user).get()
+        self.assertEqual(project._state.db, self.target)
+        self.assertEqual(sorted(project.tasks.values_list('title', flat=True)), ['T1', 'T2'])
+        habit = Habit.objects.owned_by(self.user).get()
+        self.assertEqual(list(habit.logs.values_list('year', flat=True)), [2030])
+        self.assertTrue(CalendarEvent.objects.owned_by(self.user).exists())
+        self.assertTrue(UserProfile.objects.using(self.target).filter(user=self.user).exists())
+
+        for model in (User, UserProfile, Project, Task, CalendarEvent, Habit, HabitLog, OccurrenceHorizon):
+            self.assertFalse(model.objects.using(self.source).exists(), model)
+
+    def test_same_shard_is_a_no_op_and_unknown_shards_are_rejected(self):
+        self.assertEqual(sharding.move_user(self.user, self.source), 0)
+        with self.assertRaises(ValueError):
+            sharding.move_user(self.user, 'shard_missing')
+        self.assertEqual(sharding.shard_for(self.user), self.source)
@@ -0,0 +1,90 @@
+from datetime import date, timedelta
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from core.models import Habit, HabitLog
+from core.streaks import habit_heatmap, habit_streaks, toggle_day
+
+
+class HabitLogBitsTests(SimpleTestCase):
+    def test_set_and_clear_keep_46_bytes(self):
+        log = HabitLog(year=2032)
+        self.assertEqual(bytes(log.days), bytes(46))
+        # first day, and the last day of a leap year
+        for day in (date(2032, 1, 1), date(2032, 12, 31)):
+            log.set_checked(day)
+            self.assertTrue(log.is_checked(day))
+        self.assertEqual(log.bits, 1 | 1 << 365)
+        self.assertEqual(len(log.days), 46)
+        log.set_checked(date(2032, 1, 1), False)
+        self.assertFalse(log.is_checked(date(2032, 1, 1)))
+        self.assertEqual(log.bits, 1 << 365)
+        self.assertEqual(len(log.days), 46)
+
+
+class StreakTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('alice', password='pw')
+
+    def _habit(self, start, repeat='daily'):
+        return Habit.objects.create(user=self.user, title='H', start_date=start, repeat=repeat)
+
+    def _check(self, habit, *days):
+        for day in days:
+            toggle_day(habit, day, True)
+
+    def test_streak_across_the_year_boundary(self):
+        habit = self._habit(date(2030, 12, 28))
+        self._check(habit, *(date(2030, 12, 29) + timedelta(days=n) for n in range(5)))
+        self.assertEqual(habit.logs.count(), 2)
+        streaks = habit_streaks(habit, date(2031, 1, 2))
+        self.assertEqual(streaks, {'current_streak': 5, 'longest_streak': 5, 'total_checked': 5})
+        # today still open keeps the streak, yesterday missed ends it
+        self.assertEqual(habit_streaks(habit, date(2031, 1, 3))['current_streak'], 5)
+        self.assertEqual(habit_streaks(habit, date(2031, 1, 4))['current_streak'], 0)
+
+    def test_a_gap_splits_the_runs(self):
+        habit = self._habit(date(2030, 12, 28))
+        self._check(habit, date(2030, 12, 28), date(2030, 12, 29), date(2030, 12, 30),
+                    date(2031, 1, 1), date(2031, 1, 2))
+        streaks = habit_streaks(habit, date(2031, 1, 2))
+        self.assertEqual((streaks['current_streak'], streaks['longest_streak']), (2, 3))
+
+    def test_weekly_streak_counts_scheduled_days_only(self):
+        habit = self._habit(date(2030, 12, 24), 'weekly')
+        self._check(habit, date(2030, 12, 24), date(2030, 12, 31), date(2031, 1, 7))
+        streaks = habit_streaks(habit, date(2031, 1, 10))
+        self.assertEqual(streaks, {'current_streak': 3, 'longest_streak': 3, 'total_checked': 3})
+        with self.assertRaises(ValidationError):
+            toggle_day(habit, date(2030, 12, 25))
+
+    def test_toggle_flips_and_heatmap_marks_the_day(self):
+        habit = self._habit(date(2030, 3, 1))
+        self.assertTrue(toggle_day(habit, date(2030, 3, 2)))
+        heatmap = habit_heatmap(habit, 2030)
+        self.assertEqual(len(heatmap['checked']), 365)
+        self.assertEqual(heatmap['checked'].index('1'), date(2030, 3, 2).timetuple().tm_yday - 1)
+        self.assertEqual(heatmap['scheduled'].count('1'), 306)
+        self.assertFalse(toggle_day(habit, date(2030, 3, 2)))
+        self.assertEqual(habit_heatmap(habit, 2030)['total_checked'], 0)
+
+
+class HeatmapViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('alice', password='pw')
+        cls.habit = Habit.objects.create(user=cls.user, title='H', start_date=date(2030, 1, 1))
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_year_must_be_in_range(self):
+        url = reverse('habit-heatmap', args=[self.habit.pk])
+        for year in ('0', '-1', '9999', '99999', 'soon'):
+            with self.subTest(year=year):
+                self.assertEqual(self.client.get(url, {'year': year}).status_code, 400)
+        for year in ('1', '9998'):
+            with self.subTest(year=year):
+                self.assertEqual(self.client.get(url, {'year': year}).status_code, 200)
@@ -0,0 +1,45 @@
+import json
+from datetime import date
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from core.models import Project, Task
+
+
+class ToggleTaskDoneTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('alice', password='pw')
+        cls.project = Project.objects.create(owner=cls.user, title='P', due_date=date(2030, 1, 1))
+        cls.task = Task.objects.create(project=cls.project, title='T')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def _toggle(self, body, task=None):
+        url = reverse('toggle_task_done', args=[(task or self.task).pk])
+        return self.client.post(url, body if isinstance(body, str) else json.dumps(body),
+                                content_type='application/json')
+
+    def test_true_and_false(self):
+        response = self._toggle({'done': True})
+        self.assertEqual(response.json()['new_status'], 'completed')
+        self.assertTrue(Task.objects.get(pk=self.task.pk).is_done)
+        response = self._toggle({'done': False})
+        self.assertEqual(response.json()['new_status'], 'pending')
+        self.assertFalse(Task.objects.get(pk=self.task.pk).is_done)
+
+    def test_bodies_that_are_not_a_bool_are_rejected(self):
+        for body in ({'done': 'false'}, {'done': 1}, {'done': None}, {}, [{'done': True}], '"done"', 'not json'):
+            with self.subTest(body=body):
+                self.assertEqual(self._toggle(body).status_code, 400)
+        self.assertFalse(Task.objects.get(pk=self.task.pk).is_done)
+
+    def test_other_users_tasks_are_not_found(self):
+        other = User.objects.create_user('bob', password='pw')
+        project = Project.objects.create(owner=other, title='Theirs', due_date=date(2030, 1, 1))
+        task = Task.objects.create(project=project, title='T')
+        self.assertEqual(self._toggle({'done': True}, task).status_code, 404)
+        self.assertFalse(Task.objects.get(pk=task.pk).is_done)
@@ -4,7 +4,8 @@ from . import views
 from .views import (
     HomeView, RegisterView, DashboardView,
     ProjectListView, ProjectDetailView, CreateProjectView, AddTaskView, ProjectUpdateView, ProjectDeleteView,
-    TaskUpdateView, TaskDeleteView, ToggleTaskDoneView, HabitListView, HabitCreateView, HabitUpdateView
+    TaskUpdateView, TaskDeleteView, ToggleTaskDoneView, HabitListView, HabitCreateView, HabitUpdateView,
+    ToggleHabitTodayView
 )
 
 urlpatterns = [
@@ -22,23 +23,30 @@ urlpatterns = [
     path('projects/<int:pk>/edit/', ProjectUpdateView.as_view(), name='project_edit'),
     path('projects/<int:pk>/delete/', ProjectDeleteView.as_view(), name='project_delete'),
     path('api/projects/json/', views.projects_json, name='projects-json'),
+    path('api/projects/page/', views.projects_page_json, name='projects-page-json'),
 #task urls
     path('tasks/<int:pk>/edit/', TaskUpdateView.as_view(), name='task_edit'),
     path('tasks/<int:pk>/delete/', TaskDeleteView.as_view(), name='task_delete'),
     path('projects/<int:project_id>/tasks/add/', AddTaskView.as_view(), name='add_task'),
     path('tasks/<int:pk>/toggle_done/', ToggleTaskDoneView.as_view(), name='toggle_task_done'),
+    path('api/tasks/bulk/', views.bulk_tasks, name='bulk_tasks'),
 #habit urls
     path('habits/', HabitListView.as_view(), name='habit-list'),
     path('habits/create/', HabitCreateView.as_view(), name='habit-create'),
     path('habits/<int:pk>/edit/', HabitUpdateView.as_view(), name='habit-edit'),
     path('api/habits/json/', views.habits_json, name='habits-json'),
+    path('api/habits/<int:pk>/toggle/', ToggleHabitTodayView.as_view(), name='habit-toggle'),
+    path('api/habits/<int:pk>/streak/', views.habit_streak_json, name='habit-streak'),
+    path('api/habits/<int:pk>/heatmap/', views.habit_heatmap_json, name='habit-heatmap'),
 #calendar urls
     path('calendar/', views.calendar_view, name='calendar'),
+    path('api/calendar/feed/', views.calendar_feed, name='calendar_feed'),
     path('api/calendar/events/', views.calendar_events_json, name='calendar_events_json'),
     path('api/calendar/events/create/', views.add_event, name='add_event'),
     path('api/calendar/events/<int:event_id>/', views.event_detail, name='event_detail'),
     path('api/calendar/events/<int:event_id>/update/', views.update_event, name='update_event'),
     path('api/calendar/events/<int:event_id>/delete/', views.delete_event, name='delete_event'),
+    path('api/cache/stats/', views.feed_cache_stats, name='feed_cache_stats'),
 ]
 
 
@@ -22,17 +22,22 @@ def validate_not_in_past(dt):
 # Check the user owns the project
 def validate_project_owner(user, project_id):
     from core.models import Project
-    return get_object_or_404(Project, id=project_id, owner=user)
+    return get_object_or_404(Project.objects.owned_by(user), id=project_id)
 
 # Check the user owns the task
 def validate_task_owner(user, task_id):
     from core.models import Task
-    return get_object_or_404(Task, id=task_id, project__owner=user)
+    return get_object_or_404(Task.objects.owned_by(user), id=task_id)
 
 # Check the user owns the calendar event
 def validate_event_owner(user, event_id):
     from core.models import CalendarEvent
-    return get_object_or_404(CalendarEvent, id=event_id, user=user)
+    return get_object_or_404(CalendarEvent.objects.owned_by(user), id=event_id)
+
+# Check the user owns the habit
+def validate_habit_owner(user, habit_id):
+    from core.models import Habit
+    return get_object_or_404(Habit.objects.owned_by(user), id=habit_id)
 
 def require_post(request):
     if request.method != 'POST':
@@ -1,19 +1,39 @@
-from datetime import datetime, timedelta
+from datetime import MAXYEAR, MINYEAR, datetime, time, timedelta
+from itertools import chain
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.core.exceptions import ValidationError
 from django.shortcuts import redirect, render
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import etag
 from django.views.generic import TemplateView, ListView, DetailView, CreateView, UpdateView, DeleteView, View
-from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
-from .forms import UserRegistrationForm, ProjectForm, TaskForm, CalendarEventForm, UserProfileForm, HabitForm
-from .models import Project, Task, CalendarEvent, UserProfile, Habit
-from django.http import JsonResponse
+from .forms import UserRegistrationForm, ProjectForm, TaskForm, CalendarEventForm, UserProfileForm, HabitForm, TaskFilterForm
+from .models import Project, Task, UserProfile, Habit, CalendarOccurrence
 import json
-from .validations import validate_project_owner, validate_task_owner, validate_event_owner
-import calendar
+from .validations import validate_project_owner, validate_event_owner, validate_habit_owner
 from django.contrib import messages
+from django.utils import timezone
+from .occurrences import MAX_HORIZON, ensure_materialized
+from .cache import bump_data_version, cached_feed, cache_stats, user_data_etag
+from .responses import JsonResponse, StreamingJsonResponse
+from .streaks import habit_heatmap, habit_streaks, toggle_day
+from .dashboard import get_dashboard
+from .pagination import get_page_size, keyset_page
+from .bulk import apply_bulk_action
+from .mixins import OwnedObjectMixin
+from .backends import get_profile
+
+# How far ahead to expand open-ended series when the request has no end bound
+DEFAULT_VIEW_WINDOW = timedelta(days=366)
+# Windows longer than this get a streamed response (and skip the feed cache)
+STREAMING_WINDOW = timedelta(days=62)
+# Newest first; id breaks ties so keyset pages never skip or repeat a project
+PROJECT_ORDERING = ['-created_at', 'id']
+# Soonest due first, tasks without a due date last
+TASK_ORDERING = ['due_date', 'id']
 
 
 # Home & User Management Views
@@ -46,8 +66,14 @@ class EditProfileView(LoginRequiredMixin, UpdateView):
     template_name = 'core/edit_profile.html'
     success_url = reverse_lazy('profile_detail')
 
+    # already loaded with the user by ProfileModelBackend
     def get_object(self, queryset=None):
-        return self.request.user.userprofile
+        return get_profile(self.request.user)
+
+    def form_valid(self, form):
+        if not form.has_changed():
+            return redirect(self.get_success_url())
+        return super().form_valid(form)
 
 
 class ProfileDetailView(LoginRequiredMixin, DetailView):
@@ -56,12 +82,16 @@ class ProfileDetailView(LoginRequiredMixin, DetailView):
     context_object_name = 'profile'
 
     def get_object(self, queryset=None):
-        profile, _ = UserProfile.objects.get_or_create(user=self.request.user)
-        return profile
+        return get_profile(self.request.user)
 
 class DashboardView(LoginRequiredMixin, TemplateView):
     template_name = 'core/dashboard.html'
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(get_dashboard(self.request.user))
+        return context
+
 
 # Project Views
 class ProjectListView(LoginRequiredMixin, ListView):
@@ -70,20 +100,45 @@ class ProjectListView(LoginRequiredMixin, ListView):
     context_object_name = 'projects'
 
     def get_queryset(self):
-        return Project.objects.filter(owner=self.request.user)
+        return Project.objects.owned_by(self.request.user).with_progress()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        try:
+            page = keyset_page(self.object_list, PROJECT_ORDERING, self.request.GET.get('cursor'),
+                               get_page_size(self.request.GET.get('limit')))
+        except (ValueError, ValidationError):
+            page = keyset_page(self.object_list, PROJECT_ORDERING)
+        context['projects'] = page.object_list
+        context['page'] = page
+        context['is_first_page'] = not self.request.GET.get('cursor')
+        return context
 
 
-class ProjectDetailView(LoginRequiredMixin, DetailView):
+class ProjectDetailView(OwnedObjectMixin, DetailView):
     model = Project
     template_name = 'core/project_detail.html'
     context_object_name = 'project'
 
-    def get_queryset(self):
-        return Project.objects.filter(owner=self.request.user)
-
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['tasks'] = self.object.tasks.all()
+        filter_form = TaskFilterForm(self.request.GET)
+        tasks = self.object.tasks.all()
+        tasks = filter_form.filter(tasks) if filter_form.is_valid() else tasks.defer('description')
+        try:
+            page = keyset_page(tasks, TASK_ORDERING, self.request.GET.get('cursor'),
+                               get_page_size(self.request.GET.get('limit')), nulls_last={'due_date'})
+        except (ValueError, ValidationError):
+            page = keyset_page(tasks, TASK_ORDERING, nulls_last={'due_date'})
+
+        query = self.request.GET.copy()
+        query.pop('cursor', None)
+        context['tasks'] = page.object_list
+        context['page'] = page
+        context['filter_form'] = filter_form
+        context['filter_query'] = query.urlencode()
+        context['show_details'] = filter_form.is_valid() and filter_form.cleaned_data['details']
+        context['is_first_page'] = not self.request.GET.get('cursor')
         return context
 
 
@@ -105,16 +160,12 @@ class CreateProjectView(LoginRequiredMixin, CreateView):
             return self.form_invalid(form)
 
 
-class ProjectUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class ProjectUpdateView(OwnedObjectMixin, UpdateView):
     model = Project
     form_class = ProjectForm
     template_name = 'core/project_form.html'
     success_url = reverse_lazy('project_list')
 
-    def test_func(self):
-        project = self.get_object()
-        return project.owner == self.request.user
-
     def form_valid(self, form):
         try:
             return super().form_valid(form)
@@ -126,15 +177,11 @@ class ProjectUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
             return self.form_invalid(form)
 
 
-class ProjectDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class ProjectDeleteView(OwnedObjectMixin, DeleteView):
     model = Project
     template_name = 'core/project_confirm_delete.html'
     success_url = reverse_lazy('project_list')
 
-    def test_func(self):
-        project = self.get_object()
-        return project.owner == self.request.user
-
     def delete(self, request, *args, **kwargs):
         try:
             return super().delete(request, *args, **kwargs)
@@ -143,8 +190,16 @@ class ProjectDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
             return redirect('project_list')
 
 @login_required
+@etag(user_data_etag)
+@cached_feed
 def projects_json(request):
-    projects = Project.objects.filter(owner=request.user)
+    # nothing is expanded, so a missing bound just means no limit on that side
+    try:
+        view_start, view_end = _get_window_bounds(request)
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+
+    projects = Project.objects.owned_by(request.user).overlapping(view_start, view_end)
     data = []
     for project in projects:
         data.append({
@@ -157,6 +212,30 @@ def projects_json(request):
 
 
 
+# Project list as JSON pages: ?cursor=&limit=
+@login_required
+def projects_page_json(request):
+    projects = Project.objects.owned_by(request.user).with_progress()
+    try:
+        page = keyset_page(projects, PROJECT_ORDERING, request.GET.get('cursor'),
+                           get_page_size(request.GET.get('limit')))
+    except (ValueError, ValidationError):
+        return JsonResponse({'status': 'error', 'message': 'Invalid cursor'}, status=400)
+
+    results = []
+    for project in page.object_list:
+        results.append({
+            'id': project.id,
+            'title': project.title,
+            'created_at': project.created_at.isoformat(),
+            'due_date': project.due_date.isoformat() if project.due_date else None,
+            'total_tasks': project.total_tasks,
+            'completed_tasks': project.completed_tasks,
+            'next_due': project.next_due.isoformat() if project.next_due else None,
+        })
+    return JsonResponse({'results': results, 'next_cursor': page.next_cursor})
+
+
 # Task Views
 class AddTaskView(LoginRequiredMixin, CreateView):
     model = Task
@@ -191,15 +270,11 @@ class AddTaskView(LoginRequiredMixin, CreateView):
         return context
 
 
-class TaskUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class TaskUpdateView(OwnedObjectMixin, UpdateView):
     model = Task
     form_class = TaskForm
     template_name = 'core/task_form.html'
 
-    def test_func(self):
-        task = validate_task_owner(self.request.user, self.get_object().id)
-        return True
-
     def form_valid(self, form):
         try:
             return super().form_valid(form)
@@ -214,14 +289,10 @@ class TaskUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
         return reverse_lazy('project_detail', kwargs={'pk': self.object.project.pk})
 
 
-class TaskDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class TaskDeleteView(OwnedObjectMixin, DeleteView):
     model = Task
     template_name = 'core/task_confirm_delete.html'
 
-    def test_func(self):
-        task = validate_task_owner(self.request.user, self.get_object().id)
-        return True
-
     def get_success_url(self):
         return reverse_lazy('project_detail', kwargs={'pk': self.object.project.pk})
 
@@ -234,26 +305,60 @@ class TaskDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
 
 
 class ToggleTaskDoneView(LoginRequiredMixin, View):
+    # {"done": true|false}. One UPDATE scoped by owner; no fetch, no full_clean() (an old due date
+    # must not block ticking a task off)
     def post(self, request, pk):
         try:
-            task = validate_task_owner(request.user, pk)
             data = json.loads(request.body)
-            done = data.get('done', False)
-            task.status = 'completed' if done else 'pending'
-            task.save()
-            return JsonResponse({'status': 'success', 'new_status_display': task.get_status_display()})
-        except ValidationError as e:
-            errors = getattr(e, 'message_dict', str(e))
-            return JsonResponse({'status': 'error', 'errors': errors}, status=400)
+            if not isinstance(data, dict):
+                raise ValueError("Expected a JSON object")
+            done = data.get('done')
+            if not isinstance(done, bool):
+                raise ValueError("'done' must be true or false")
+            status = 'completed' if done else 'pending'
+            updated = Task.objects.owned_by(request.user).filter(pk=pk).update(status=status, is_done=done)
+            if not updated:
+                return JsonResponse({'status': 'error', 'message': 'Task not found'}, status=404)
+            # update() skips post_save
+            bump_data_version(request.user.pk)
+            return JsonResponse({'status': 'success', 'done': done, 'new_status': status,
+                                 'new_status_display': dict(Task.STATUS_CHOICES)[status]})
+        except ValueError as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
         except Exception as e:
             return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
 
 
+# One action on many tasks: {"action": "complete|reopen|reprioritize|move|delete", "ids": [...],
+# "priority": ..., "project": ...}. Applied in one transaction; any unknown/foreign id is a 404
+# and nothing is changed.
+@login_required
+def bulk_tasks(request):
+    if request.method != 'POST':
+        return JsonResponse({'status': 'error', 'message': 'Only POST allowed'}, status=405)
+    try:
+        data = json.loads(request.body)
+        if not isinstance(data, dict):
+            raise ValueError("Expected a JSON object")
+        results = apply_bulk_action(request.user, data.get('action'), data)
+        return JsonResponse({'status': 'success',
+                             'results': [{'id': task_id, 'result': result} for task_id, result in results.items()]})
+    except Task.DoesNotExist as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=404)
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    except ValidationError as e:
+        errors = getattr(e, 'message_dict', str(e))
+        return JsonResponse({'status': 'error', 'errors': errors}, status=400)
+    except Exception as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
+
+
 #calendar and events views
 @login_required()
 def calendar_view(request):
     try:
-        projects = Project.objects.filter(owner=request.user)
+        projects = Project.objects.owned_by(request.user)
         events = []
         for project in projects:
             if project.due_date:
@@ -270,90 +375,211 @@ def calendar_view(request):
         messages.error(request, f"Error loading calendar: {e}")
         return redirect('dashboard')
 
-@login_required
-def calendar_events_json(request):
-    events = CalendarEvent.objects.filter(user=request.user)
-    data = []
-
-    start_param = request.GET.get('start')  # e.g., "2025-08-01"
-    end_param = request.GET.get('end')      # e.g., "2025-08-31"
-    view_start = datetime.fromisoformat(start_param) if start_param else None
-    view_end = datetime.fromisoformat(end_param) if end_param else None
+# FullCalendar's ?start=&end= params as aware datetimes, None for a missing one
+def _get_window_bounds(request):
+    bounds = []
+    for param in ('start', 'end'):
+        value = request.GET.get(param)
+        if not value:
+            bounds.append(None)
+            continue
+        dt = datetime.fromisoformat(value)
+        if timezone.is_naive(dt):
+            dt = timezone.make_aware(dt, timezone.get_current_timezone())
+        bounds.append(dt)
+    return bounds
+
+
+# The [start, end) window to expand occurrences in
+def _get_view_window(request):
+    view_start, view_end = _get_window_bounds(request)
+    # open-ended series need a bounded window when the client doesn't send one: look ahead from
+    # today's midnight, so the window (and the cache key, see core.cache) is the same all day
+    if view_start is None:
+        view_start = view_end - DEFAULT_VIEW_WINDOW if view_end else timezone.make_aware(
+            datetime.combine(timezone.localdate(), time.min))
+    if view_end is None:
+        view_end = view_start + DEFAULT_VIEW_WINDOW
+    if view_end - view_start > MAX_HORIZON:
+        raise ValueError(f"The window can span at most {MAX_HORIZON.days} days")
+    return view_start, view_end
+
+
+def _event_item(event, occurrence):
+    return {
+        'id': str(event.id) if occurrence.start == event.start_time else f"{event.id}-{occurrence.start.date()}",
+        'title': event.title,
+        'start': occurrence.start.isoformat(),
+        'end': occurrence.end.isoformat() if event.end_time else None,
+        'allDay': event.all_day,
+        'description': event.description,
+        'repeat': event.repeat,
+    }
+
+
+def _habit_item(habit, occurrence):
+    current_date = timezone.localtime(occurrence.start).date()
+    return {
+        'id': f"habit-{habit.id}-{current_date}",
+        'title': habit.title,
+        'start': datetime.combine(current_date, datetime.min.time()).isoformat(),
+        'end': datetime.combine(current_date, datetime.min.time()).isoformat(),
+        'allDay': True,
+        'description': habit.description,
+        'repeat': habit.repeat,
+        'type': 'habit'
+    }
+
+
+# Event and/or habit occurrences in the window as a single range scan
+def _occurrence_rows(user, view_start, view_end, events=True, habits=True):
+    rows = CalendarOccurrence.objects.owned_by(user).filter(start__lt=view_end, end__gte=view_start)
+    if not habits:
+        rows = rows.filter(event__isnull=False).select_related('event')
+    elif not events:
+        rows = rows.filter(habit__isnull=False).select_related('habit')
+    else:
+        rows = rows.select_related('event', 'habit')
+    return rows.order_by('start').iterator(chunk_size=2000)
+
+
+def _occurrence_items(user, view_start, view_end, events=True, habits=True):
+    for occurrence in _occurrence_rows(user, view_start, view_end, events, habits):
+        if occurrence.event_id:
+            yield _event_item(occurrence.event, occurrence)
+        else:
+            yield _habit_item(occurrence.habit, occurrence)
+
+
+# Projects as FullCalendar events spanning creation to due date
+def _project_items(user, view_start, view_end):
+    for project in Project.objects.owned_by(user).overlapping(view_start, view_end).iterator():
+        yield {
+            'id': project.id,
+            'title': project.title,
+            'start': project.created_at.isoformat(),
+            'end': project.due_date.isoformat() if project.due_date else project.created_at.isoformat(),
+            'type': 'project'
+        }
 
-    for event in events:
-        data.append({
-            'id': str(event.id),
-            'title': event.title,
-            'start': event.start_time.isoformat(),
-            'end': event.end_time.isoformat() if event.end_time else None,
-            'allDay': event.all_day,
-            'description': event.description,
-            'repeat': event.repeat,
-        })
 
-        # repeated events
-        if event.repeat != 'none' and event.repeat_until:
-            current_start = event.start_time
-            current_end = event.end_time
-            repeat_until = event.repeat_until
-
-            occurrence_count = 0
-            MAX_OCCURRENCES = 100
-
-            while True:
-                if event.repeat == 'daily':
-                    current_start += timedelta(days=1)
-                    if current_end:
-                        current_end += timedelta(days=1)
-                elif event.repeat == 'weekly':
-                    current_start += timedelta(weeks=1)
-                    if current_end:
-                        current_end += timedelta(weeks=1)
-                elif event.repeat == 'monthly':
-                    month = current_start.month + 1
-                    year = current_start.year
-                    if month > 12:
-                        month = 1
-                        year += 1
-                    last_day = calendar.monthrange(year, month)[1]
-                    day = min(current_start.day, last_day)
-                    current_start = current_start.replace(year=year, month=month, day=day)
-
-                    if current_end:
-                        month_end = current_end.month + 1
-                        year_end = current_end.year
-                        if month_end > 12:
-                            month_end = 1
-                            year_end += 1
-                        last_day_end = calendar.monthrange(year_end, month_end)[1]
-                        day_end = min(current_end.day, last_day_end)
-                        current_end = current_end.replace(year=year_end, month=month_end, day=day_end)
-
-                occurrence_count += 1
-                if occurrence_count > MAX_OCCURRENCES:
-                    break
-
-                if current_start.date() > repeat_until:
-                    break
-
-                if view_end and current_start > view_end:
-                    break
-
-                if view_start and current_start < view_start:
-                    continue
-
-                # Add repeated occurrence
-                data.append({
-                    'id': f"{event.id}-{current_start.date()}",
+# Compact wire format (?format=compact): each series' metadata is sent once, followed by its
+# occurrences as start offsets and durations. Timed series count seconds from `origin` (epoch
+# seconds of the window start); habits are date based and count days from `originDate`.
+# Projects don't repeat, so they are passed through unchanged in `items`.
+def _compact_payload(user, view_start, view_end, events=True, habits=True, projects=False):
+    origin_date = timezone.localtime(view_start).date()
+    series = {}
+
+    for occurrence in _occurrence_rows(user, view_start, view_end, events, habits):
+        if occurrence.event_id:
+            event = occurrence.event
+            entry = series.get(('event', event.id))
+            if entry is None:
+                entry = series[('event', event.id)] = {
+                    'id': str(event.id),
                     'title': event.title,
-                    'start': current_start.isoformat(),
-                    'end': current_end.isoformat() if current_end else None,
-                    'allDay': event.all_day,
                     'description': event.description,
+                    'allDay': event.all_day,
                     'repeat': event.repeat,
-                })
+                    'starts': [],
+                    'durations': [],
+                }
+            entry['starts'].append(int((occurrence.start - view_start).total_seconds()))
+            entry['durations'].append(int((occurrence.end - occurrence.start).total_seconds()) if event.end_time else None)
+        else:
+            habit = occurrence.habit
+            entry = series.get(('habit', habit.id))
+            if entry is None:
+                entry = series[('habit', habit.id)] = {
+                    'id': f"habit-{habit.id}",
+                    'title': habit.title,
+                    'description': habit.description,
+                    'allDay': True,
+                    'repeat': habit.repeat,
+                    'type': 'habit',
+                    'dates': True,
+                    'starts': [],
+                }
+            entry['starts'].append((timezone.localtime(occurrence.start).date() - origin_date).days)
+
+    for entry in series.values():
+        durations = entry.pop('durations', None)
+        if durations is None:
+            continue
+        # a series almost always has one duration, so send it once
+        if len(set(durations)) == 1:
+            entry['duration'] = durations[0]
+        else:
+            entry['durations'] = durations
+
+    return {
+        'origin': int(view_start.timestamp()),
+        'originDate': origin_date.isoformat(),
+        'series': list(series.values()),
+        'items': list(_project_items(user, view_start, view_end)) if projects else [],
+    }
+
+
+def _wants_compact(request):
+    return request.GET.get('format') == 'compact'
+
+
+# Year views and long daily series are streamed instead of being built up in memory
+def _json_items(items, view_start, view_end):
+    if view_end - view_start > STREAMING_WINDOW:
+        return StreamingJsonResponse(items)
+    return JsonResponse(list(items), safe=False)
+
+
+FEED_TYPES = ('events', 'habits', 'projects')
+
+
+# Everything the calendar shows for a window in one request: ?start=&end=&types=events,habits,projects[&format=compact]
+@login_required
+@etag(user_data_etag)
+@cached_feed
+def calendar_feed(request):
+    try:
+        view_start, view_end = _get_view_window(request)
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+
+    types = request.GET.get('types')
+    types = set(types.split(',')) if types else set(FEED_TYPES)
+    unknown = types - set(FEED_TYPES)
+    if unknown:
+        return JsonResponse({'status': 'error', 'message': f"Unknown types: {', '.join(sorted(unknown))}"}, status=400)
+
+    if 'events' in types or 'habits' in types:
+        ensure_materialized(request.user, view_start, view_end)
+    if _wants_compact(request):
+        return JsonResponse(_compact_payload(request.user, view_start, view_end, events='events' in types,
+                                             habits='habits' in types, projects='projects' in types))
+
+    sources = []
+    if 'events' in types or 'habits' in types:
+        sources.append(_occurrence_items(request.user, view_start, view_end,
+                                         events='events' in types, habits='habits' in types))
+    if 'projects' in types:
+        sources.append(_project_items(request.user, view_start, view_end))
+    return _json_items(chain.from_iterable(sources), view_start, view_end)
 
-    return JsonResponse(data, safe=False)
+
+@login_required
+@etag(user_data_etag)
+@cached_feed
+def calendar_events_json(request):
+    try:
+        view_start, view_end = _get_view_window(request)
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+
+    ensure_materialized(request.user, view_start, view_end)
+    if _wants_compact(request):
+        return JsonResponse(_compact_payload(request.user, view_start, view_end, events=True, habits=False))
+    data = _occurrence_items(request.user, view_start, view_end, events=True, habits=False)
+    return _json_items(data, view_start, view_end)
 
 @csrf_exempt
 @login_required
@@ -418,6 +644,7 @@ def delete_event(request, event_id):
 
 
 @login_required
+@etag(user_data_etag)
 def event_detail(request, event_id):
     try:
         event = validate_event_owner(request.user, event_id)
@@ -442,7 +669,16 @@ class HabitListView(LoginRequiredMixin, ListView):
     context_object_name = 'habits'
 
     def get_queryset(self):
-        return Habit.objects.filter(user=self.request.user, active=True).order_by('title')
+        return Habit.objects.owned_by(self.request.user).filter(active=True).prefetch_related('logs').order_by('title')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        today = timezone.localdate()
+        for habit in context['habits']:
+            habit.due_today = habit.is_due_on(today)
+            habit.checked_today = any(log.year == today.year and log.is_checked(today) for log in habit.logs.all())
+            habit.streaks = habit_streaks(habit, today)
+        return context
 
 class HabitCreateView(LoginRequiredMixin, CreateView):
     model = Habit
@@ -461,15 +697,12 @@ class HabitCreateView(LoginRequiredMixin, CreateView):
             form.add_error(None, "Unexpected error: " + str(e))
             return self.form_invalid(form)
 
-class HabitUpdateView(LoginRequiredMixin, UpdateView):
+class HabitUpdateView(OwnedObjectMixin, UpdateView):
     model = Habit
     form_class = HabitForm
     template_name = 'core/habit_form.html'
     success_url = reverse_lazy('habit-list')
 
-    def get_queryset(self):
-        return Habit.objects.filter(user=self.request.user)
-
     def form_valid(self, form):
         try:
             return super().form_valid(form)
@@ -480,53 +713,65 @@ class HabitUpdateView(LoginRequiredMixin, UpdateView):
             form.add_error(None, "Unexpected error: " + str(e))
             return self.form_invalid(form)
 
+class ToggleHabitTodayView(LoginRequiredMixin, View):
+    # {"done": true|false|null}; null or no body flips today's check
+    def post(self, request, pk):
+        habit = validate_habit_owner(request.user, pk)
+        try:
+            data = json.loads(request.body or '{}')
+            if not isinstance(data, dict):
+                raise ValueError("Expected a JSON object")
+            done = data.get('done')
+            if done is not None and not isinstance(done, bool):
+                raise ValueError("'done' must be true, false or null")
+            today = timezone.localdate()
+            done = toggle_day(habit, today, done)
+            return JsonResponse({'status': 'success', 'done': done, **habit_streaks(habit, today)})
+        except ValueError as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+        except ValidationError as e:
+            return JsonResponse({'status': 'error', 'message': ' '.join(e.messages)}, status=400)
+        except Exception as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
+
+
 @login_required
+def habit_streak_json(request, pk):
+    habit = validate_habit_owner(request.user, pk)
+    return JsonResponse(habit_streaks(habit, timezone.localdate()))
+
+
+@login_required
+def habit_heatmap_json(request, pk):
+    habit = validate_habit_owner(request.user, pk)
+    try:
+        year = int(request.GET.get('year', timezone.localdate().year))
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'Invalid year'}, status=400)
+    # the heatmap needs January 1st of the following year too
+    if not MINYEAR <= year < MAXYEAR:
+        return JsonResponse({'status': 'error', 'message': f'Year must be between {MINYEAR} and {MAXYEAR - 1}'},
+                            status=400)
+    return JsonResponse(habit_heatmap(habit, year))
+
+
+@login_required
+@etag(user_data_etag)
+@cached_feed
 def habits_json(request):
-    habits = Habit.objects.filter(user=request.user, active=True)
-    data = []
+    try:
+        view_start, view_end = _get_view_window(request)
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+
+    ensure_materialized(request.user, view_start, view_end)
+    if _wants_compact(request):
+        return JsonResponse(_compact_payload(request.user, view_start, view_end, events=False, habits=True))
+    data = _occurrence_items(request.user, view_start, view_end, events=False, habits=True)
+    return _json_items(data, view_start, view_end)
+
 
-    start_param = request.GET.get('start')
-    end_param = request.GET.get('end')
-    view_start = datetime.fromisoformat(start_param) if start_param else None
-    view_end = datetime.fromisoformat(end_param) if end_param else None
-
-    for habit in habits:
-        current_date = habit.start_date
-        end_date = habit.end_date or habit.start_date  # If no end date, treat as single day
-
-        while current_date <= end_date:
-            # Skip if outside view range
-            if view_end and current_date > view_end.date():
-                break
-            if view_start and current_date < view_start.date():
-                current_date += timedelta(days=1) if habit.repeat in ['daily','none'] else timedelta(weeks=1)
-                continue
-
-            data.append({
-                'id': f"habit-{habit.id}-{current_date}",
-                'title': habit.title,
-                'start': datetime.combine(current_date, datetime.min.time()).isoformat(),
-                'end': datetime.combine(current_date, datetime.min.time()).isoformat(),
-                'allDay': True,
-                'description': habit.description,
-                'repeat': habit.repeat,
-                'type': 'habit'
-            })
-
-            if habit.repeat == 'daily':
-                current_date += timedelta(days=1)
-            elif habit.repeat == 'weekly':
-                current_date += timedelta(weeks=1)
-            elif habit.repeat == 'monthly':
-                month = current_date.month + 1
-                year = current_date.year
-                if month > 12:
-                    month = 1
-                    year += 1
-                last_day = calendar.monthrange(year, month)[1]
-                day = min(current_date.day, last_day)
-                current_date = current_date.replace(year=year, month=month, day=day)
-            else:
-                break
-
-    return JsonResponse(data, safe=False)
\ No newline at end of file
+# Hit/miss counters of the feed cache
+@staff_member_required
+def feed_cache_stats(request):
+    return JsonResponse(cache_stats())
@@ -13,6 +13,35 @@ document.addEventListener('DOMContentLoaded', function() {
     return `${year}-${month}-${day}T${hours}:${minutes}`;
   }
 
+  // expand the compact feed (series metadata + start offsets) into FullCalendar events
+  function decodeCompactFeed(payload) {
+    const events = [];
+    const originMs = payload.origin * 1000;
+    const originDay = Date.parse(payload.originDate + 'T00:00:00Z');
+
+    payload.series.forEach(s => {
+      const { starts, duration, durations, dates, ...meta } = s;
+      starts.forEach((offset, i) => {
+        const length = durations ? durations[i] : duration;
+        if (dates) {
+          // date based series count whole days from originDate
+          const day = new Date(originDay + offset * 86400000).toISOString().slice(0, 10);
+          events.push({ ...meta, id: `${s.id}-${day}`, start: day, end: day });
+        } else {
+          const start = new Date(originMs + offset * 1000);
+          events.push({
+            ...meta,
+            id: `${s.id}-${i}`,
+            groupId: s.id,
+            start: start.toISOString(),
+            end: length == null ? null : new Date(start.getTime() + length * 1000).toISOString()
+          });
+        }
+      });
+    });
+    return events.concat(payload.items);
+  }
+
   const calendar = new FullCalendar.Calendar(calendarEl, {
     initialView: 'dayGridMonth',
     selectable: true,
@@ -22,25 +51,16 @@ document.addEventListener('DOMContentLoaded', function() {
       right: 'dayGridMonth,timeGridWeek,timeGridDay'
     },
 
-       // Load events from multiple api
+       // Load events, habits and projects for the visible range in one request
     events: function(fetchInfo, successCallback, failureCallback) {
-      Promise.all([
-        fetch('/api/calendar/events/').then(res => res.json()),
-        fetch('/api/habits/json/').then(res => res.json()),
-        fetch('/api/projects/json/').then(res => res.json())
-      ])
-      .then(([eventsData, habitsData, projectsData]) => {
-          // Map projects into FullCalendar format
-        const projects = projectsData.map(p => ({
-          id: p.id,
-          title: p.title,
-          start: p.created_at || new Date().toISOString(),
-          end: p.due_date || p.created_at || new Date().toISOString(),
-          extendedProps: { type: 'project' }
-        }));
-        successCallback(eventsData.concat(habitsData, projects));
-      })
-      .catch(err => failureCallback(err));
+      const params = new URLSearchParams({ start: fetchInfo.startStr, end: fetchInfo.endStr, format: 'compact' });
+      fetch(`/api/calendar/feed/?${params}`)
+        .then(res => {
+          if (!res.ok) throw new Error('Failed to load calendar');
+          return res.json();
+        })
+        .then(data => successCallback(decodeCompactFeed(data)))
+        .catch(err => failureCallback(err));
     },
 
       // customize how events appear in calendar
@@ -74,8 +94,8 @@ document.addEventListener('DOMContentLoaded', function() {
         return;
       }
 
-      // otherwise, fetch calendar event details
-      const eventId = info.event.id;
+      // otherwise, fetch calendar event details (repeated occurrences share the series id as groupId)
+      const eventId = info.event.groupId || info.event.id;
       fetch(`/api/calendar/events/${eventId}/update/`)
         .then(res => {
           if (!res.ok) throw new Error('Failed to load event data');
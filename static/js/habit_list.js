@@ -1,10 +1,44 @@
+function getCookie(name) {
+  let cookieValue = null;
+  if (document.cookie && document.cookie !== '') {
+    document.cookie.split(';').forEach(cookie => {
+      cookie = cookie.trim();
+      if (cookie.startsWith(name + '=')) cookieValue = decodeURIComponent(cookie.slice(name.length + 1));
+    });
+  }
+  return cookieValue;
+}
+
+function showStreak(habitId, data) {
+  const el = document.getElementById(`habit-streak-${habitId}`);
+  if (el) el.textContent = `Streak: ${data.current_streak} (best ${data.longest_streak})`;
+}
+
 document.querySelectorAll('.habit-completed-checkbox').forEach(checkbox => {
+    const habitId = checkbox.dataset.habitId;
+
     checkbox.addEventListener('change', (e) => {
       const label = e.target.nextElementSibling;
-      if (e.target.checked) {
-        label.style.textDecoration = 'line-through';
-      } else {
-        label.style.textDecoration = 'none';
-      }
+      const done = e.target.checked;
+      label.style.textDecoration = done ? 'line-through' : 'none';
+      e.target.disabled = true;
+
+      // store today's check-in
+      fetch(`/api/habits/${habitId}/toggle/`, {
+        method: 'POST',
+        headers: { 'X-CSRFToken': getCookie('csrftoken'), 'Content-Type': 'application/json' },
+        body: JSON.stringify({ done })
+      })
+      .then(res => {
+        if (!res.ok) throw new Error('Failed to save habit check-in');
+        return res.json();
+      })
+      .then(data => showStreak(habitId, data))
+      .catch(err => {
+        alert(err.message);
+        e.target.checked = !done;
+        label.style.textDecoration = done ? 'none' : 'line-through';
+      })
+      .finally(() => e.target.disabled = false);
     });
-  });
\ No newline at end of file
+  });